@@ -13,6 +13,8 @@ from TradingEnv import TradingEnv
 SEED = 42
 TRAIN_TIMESTEPS = 30_000
 EVAL_EPISODES = 5
+N_STEPS = 2048
+EVAL_INTERVAL = 3 * N_STEPS   # report to the pruner every 3 rollouts
 
 # =====================
 # EVALUATION FUNCTION
@@ -70,17 +72,28 @@ def objective(trial):
         learning_rate=learning_rate,
         gamma=gamma,
         ent_coef=ent_coef,
-        n_steps=2048,
+        n_steps=N_STEPS,
         batch_size=64,
         verbose=0,
         seed=SEED,
     )
 
-    # --- Train ---
-    model.learn(total_timesteps=TRAIN_TIMESTEPS)
-
-    # --- Evaluate ---
-    score = evaluate(model, seed=SEED)
+    # --- Train, reporting intermediate scores so the pruner can stop
+    # unpromising trials early ---
+    step = 0
+    score = None
+    while model.num_timesteps < TRAIN_TIMESTEPS:
+        chunk = min(EVAL_INTERVAL, TRAIN_TIMESTEPS - model.num_timesteps)
+        model.learn(total_timesteps=chunk, reset_num_timesteps=False)
+
+        # --- Evaluate ---
+        score = evaluate(model, seed=SEED)
+        trial.report(score, step)
+        step += 1
+
+        if trial.should_prune():
+            train_env.close()
+            raise optuna.TrialPruned()
 
     train_env.close()
 
@@ -1,3 +1,4 @@
+import random
 import gymnasium as gym 
 from gymnasium import spaces 
 import numpy as np 
@@ -8,6 +9,12 @@ from environment import MarketEnvironment
 from logger import Logger 
 from events import OrderSubmissionEvent 
 from order import Order
+from observation import ObservationEncoder
+from agents import ExternalAgent
+from run_simulation import build_ecosystem
+from tape import Tape
+from features import MicrostructureFeatures
+from sanity_checks import validate_book_snapshot, validate_observation
 class TradingEnv(gym.Env):
     metadata = {"render_modes": []}
 
@@ -22,6 +29,13 @@ class TradingEnv(gym.Env):
         transaction_cost=0.01,
         lambda_risk=0.001,          #  configurable λ
         seed=42,
+        validate=False,             # run invariant checks every step
+        on_episode_end=None,        # callback(summary dict) at episode end
+        market="synthetic",         # "synthetic" random walk, "ecosystem" or "tape"
+        step_dt=1.0,                # simulated time per step (ecosystem / tape)
+        warmup=20.0,                # simulated time before the first step (ecosystem / tape)
+        tape=None,                  # Tape or tape path (tape mode)
+        features=False,             # append MicrostructureFeatures to the observation
 
     ):
         super().__init__()
@@ -32,18 +46,39 @@ class TradingEnv(gym.Env):
         self.max_cash = max_cash
         self.transaction_cost = transaction_cost
         self.lambda_risk = lambda_risk
+        self.validate = validate
+        self.on_episode_end = on_episode_end
+        if market not in ("synthetic", "ecosystem", "tape"):
+            raise ValueError(f"Unknown market mode: {market}")
+        if market == "tape" and tape is None:
+            raise ValueError("Tape mode needs a tape")
+        self.market = market
+        self.step_dt = step_dt
+        self.warmup = warmup
+        self.tape = Tape.load(tape) if isinstance(tape, str) else tape
 
         self._rng = np.random.default_rng(seed)
 
         self.action_space = spaces.Discrete(3)
         self.mid_price = 100.0
         self.price_vol = 0.1   # small noise
-        obs_dim = 2 * book_depth + 2 * book_depth + 2
+        self.encoder = ObservationEncoder(book_depth, max_inventory, max_cash)
+        obs_dim = self.encoder.size
+
+        self._build_market()
+        self.features = MicrostructureFeatures(self.book, self.engine) if features else None
+        if self.features is not None:
+            obs_dim += self.features.size
+
         self.observation_space = spaces.Box(
             low=0.0, high=1.0, shape=(obs_dim,), dtype=np.float32
         )
-
-        self._build_market()
+        # Observations are written into these buffers and returned as is:
+        # copy an observation to keep it past the next step / reset. reset
+        # has its own buffer so a vec env's terminal_observation survives
+        # the auto-reset that follows it.
+        self._obs = np.zeros(obs_dim, dtype=np.float32)
+        self._reset_obs = np.zeros(obs_dim, dtype=np.float32)
 
 
 
@@ -54,7 +89,90 @@ class TradingEnv(gym.Env):
 
         self.engine = MarketEngine(self.book, self.logger)
         self.env = MarketEnvironment(self.engine, self.config)
+        self._reset_account()
+
+
+
+    def _reset_market(self):
+        # Episodes are short, so reuse the market objects instead of
+        # rebuilding them on every reset
+        self.engine.reset()
+        self.env.reset()
+        if self.features is not None:
+            self.features.reset()
+        self._reset_account()
+        if self.market == "ecosystem":
+            self._start_ecosystem()
+        elif self.market == "tape":
+            self._start_tape()
+
+
+
+    def _start_ecosystem(self):
+        # Background agents and order latencies draw from a private
+        # random.Random seeded from the env's own generator, leaving the
+        # global `random` stream alone
+        seed = int(self._rng.integers(2**32))
+        rng = random.Random(seed)
+        self.env.rng = rng
+        build_ecosystem(self.engine, self.env, seed=seed, rng=rng)
+
+        self._add_trader()
+        self.mid_price = 100.0
+        self.engine.run_until(self.warmup)
+
+
+
+    def _start_tape(self):
+        # Replay a random window of background flow: `warmup` worth of
+        # messages to build the book, then one step_dt slice per step
+        horizon = self.max_steps * self.step_dt
+        lo = self.tape.start_time + self.warmup
+        hi = max(lo, self.tape.end_time - horizon)
+        start = float(self._rng.uniform(lo, hi))
+
+        self.tape.replay(self.book, start - self.warmup, start)
+        self._add_trader()
+        self.mid_price = 100.0
+        self.engine.run_until(start)
+
+
+
+    def _add_trader(self):
+        # The RL agent gets an owner id so its fills are booked in the
+        # engine's registry
+        self.trader = ExternalAgent("RL", arrival_rate=0.0)
+        self.trader.balance = self.cash
+        self.engine.add_agent(self.trader)
+
 
+
+    def _advance_market(self, action, mid):
+        # Send the RL order through the engine, then run only the events
+        # that fall inside this step's time slice
+        side = None
+        if action == 1 and self.cash >= mid:
+            side = "BUY"
+        elif action == 2 and self.inventory > 0:
+            side = "SELL"
+
+        if side is not None:
+            order = Order(f"agent-{self.step_count}", side, None, 1,
+                          self.engine.time, owner=self.trader.uid)
+            self.engine.schedule(OrderSubmissionEvent(self.engine.time, order))
+
+        t0 = self.engine.time
+        self.engine.run_until(t0 + self.step_dt)
+        if self.market == "tape":
+            self.tape.replay(self.book, t0, t0 + self.step_dt)
+
+        self.inventory = self.trader.inventory
+        self.cash = self.trader.balance
+        return self._get_mid_price()
+
+
+
+    def _reset_account(self):
         self.inventory = 0
         self.cash = float(self.max_cash)
 
@@ -66,6 +184,12 @@ class TradingEnv(gym.Env):
 
 
     def _get_mid_price(self):
+        if self.market != "synthetic":
+            # Book mid, holding the last value while one side is empty
+            bids, asks = self.book.bids, self.book.asks
+            if bids and asks:
+                self.mid_price = 0.5 * (asks[0][0] - bids[0][0])
+            return self.mid_price
         # snap = self.book.current_snapshot()
         # bid, ask = snap.best_bid(), snap.best_ask()
         # return 0.5 * (bid + ask) if bid and ask else 100.0
@@ -74,47 +198,23 @@ class TradingEnv(gym.Env):
     
 
 
-    def _normalize_obs(self):
-
+    def _normalize_obs(self, out):
         snap = self.book.current_snapshot()
-        bids = snap.bids[:self.book_depth]
-        asks = snap.asks[:self.book_depth]
-
-        bid_prices = [p for p, q in bids]
-        bid_sizes  = [q for p, q in bids]
-        ask_prices = [p for p, q in asks]
-        ask_sizes  = [q for p, q in asks]
-
         mid_price = self._get_mid_price()
+        n = self.encoder.size
+        self.encoder.encode(snap, mid_price, self.inventory, self.cash, out=out[:n])
+        if self.features is not None:
+            self.features.vector(out=out[n:])
+        return out
 
-        norm_bid_prices = [(mid_price - p) / mid_price for p in bid_prices]
-        norm_bid_sizes  = [s / self.max_cash for s in bid_sizes]
-
-        norm_ask_prices = [(p - mid_price) / mid_price for p in ask_prices]
-        norm_ask_sizes  = [s / self.max_cash for s in ask_sizes]
-
-        while len(norm_bid_prices) < self.book_depth:
-            norm_bid_prices.append(0.0)
-            norm_bid_sizes.append(0.0)
 
-        while len(norm_ask_prices) < self.book_depth:
-            norm_ask_prices.append(0.0)
-            norm_ask_sizes.append(0.0)
 
-        norm_inventory = (self.inventory + self.max_inventory) / (2 * self.max_inventory)
-        norm_cash = self.cash / self.max_cash
+    def _check(self, obs):
+        validate_observation(obs, self.observation_space)
+        validate_book_snapshot(self.book.current_snapshot())
+        assert self.inventory >= 0, "Inventory went negative"
+        assert np.isfinite(self.cash), "Cash is NaN or inf"
 
-        obs = np.array(
-            norm_bid_prices
-            + norm_bid_sizes
-            + norm_ask_prices
-            + norm_ask_sizes
-            + [norm_inventory, norm_cash],
-            dtype=np.float32,
-        )
-
-        return np.clip(obs, 0.0, 1.0)
-    
 
 
     def calculate_reward(self, mid_price, action):
@@ -133,11 +233,11 @@ class TradingEnv(gym.Env):
         if seed is not None:
             self._rng = np.random.default_rng(seed)
 
-        self._build_market()
-        obs = self._normalize_obs()
+        self._reset_market()
+        obs = self._normalize_obs(self._reset_obs)
         info = {}
-        assert np.all(np.isfinite(obs)), "Observation contains NaN or inf"
-        assert obs.shape == self.observation_space.shape, "Observation has incorrect shape"
+        if self.validate:
+            self._check(obs)
         return obs, info
 
 
@@ -149,7 +249,10 @@ class TradingEnv(gym.Env):
 
         mid = self._get_mid_price()
 
-        if action == 1 and self.cash >= mid:
+        if self.market != "synthetic":
+            mid = self._advance_market(action, mid)
+
+        elif action == 1 and self.cash >= mid:
             self.engine.order_book.submit(
                 Order(f"agent-{self.step_count}", "BUY", None, 1, self.engine.time)
             )
@@ -162,7 +265,9 @@ class TradingEnv(gym.Env):
             )
             self.inventory -= 1
             self.cash += mid
-        self.engine.run()
+
+        if self.market == "synthetic":
+            self.engine.run()
         reward, value, drawdown = self.calculate_reward(mid, action)
 
         if self.step_count >= self.max_steps:
@@ -170,7 +275,7 @@ class TradingEnv(gym.Env):
         if abs(self.inventory) > self.max_inventory or self.cash <= 0:
             terminated = True
 
-        obs = self._normalize_obs()
+        obs = self._normalize_obs(self._obs)
 
         info = {
             "portfolio_value": value,
@@ -178,9 +283,14 @@ class TradingEnv(gym.Env):
             "inventory": self.inventory,
             "cash": self.cash,
         }
-        if terminated or truncated:
-            print("Episode ended at step", self.step_count)
-
-        assert np.all(np.isfinite(obs)), "Observation contains NaN or inf"
-        assert obs.shape == self.observation_space.shape, "Observation has incorrect shape"
+        if (terminated or truncated) and self.on_episode_end is not None:
+            self.on_episode_end({
+                "steps": self.step_count,
+                "terminated": terminated,
+                "truncated": truncated,
+                **info,
+            })
+
+        if self.validate:
+            self._check(obs)
         return obs, reward, terminated, truncated, info
@@ -1,21 +1,39 @@
 class Action:
-    pass
+    slot = 0  # trader index within a population agent
 
 
 class PlaceLimit(Action):
-    def __init__(self, side, price, qty):
+    def __init__(self, side, price, qty, slot=0):
         self.side = side
         self.price = price
         self.qty = qty
+        self.slot = slot
+        self.order_id = None  # filled in by the environment
 
 
 class PlaceMarket(Action):
-    def __init__(self, side, qty):
+    def __init__(self, side, qty, slot=0):
         self.side = side
         self.qty = qty
+        self.slot = slot
+        self.order_id = None  # filled in by the environment
 
 
 class Cancel(Action):
     def __init__(self, order_id):
         self.order_id = order_id
         # NOTE: Cancels are assumed instantaneous in this model
+
+
+class Amend(Action):
+    def __init__(self, order_id, qty):
+        self.order_id = order_id
+        self.qty = qty
+        # NOTE: Resizes a resting order in place; decreases keep queue priority
+
+
+class ReplaceQuotes(Action):
+    def __init__(self, bids, asks):
+        self.bids = bids  # list of (price, qty); empty pulls the side
+        self.asks = asks
+        # NOTE: Replaces the agent's ladders on both sides in one event
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class AgentStateRegistry:
+    """
+    Columnar inventory / cash store for every agent in a MarketEngine.
+
+    Rows are indexed by the integer owner id handed out by
+    MarketEngine.add_agent (population agents own one row per trader).
+    Fills update the arrays in one place, and positions or
+    mark-to-market values for all agents are single array operations.
+    """
+
+    def __init__(self, capacity=64):
+        self.size = 0
+        self.names = []
+        # One (label, first row) per allocate call, so population agents
+        # can be reported as a single aggregate position
+        self.groups = []
+        self.agents = []  # agents bound to rows, unbound by clear()
+        self.inventory = np.zeros(capacity, dtype=np.int64)
+        self.cash = np.zeros(capacity, dtype=np.float64)
+        self.initial_cash = np.zeros(capacity, dtype=np.float64)
+
+    def _grow(self, needed):
+        capacity = len(self.inventory)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("inventory", "cash", "initial_cash"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def allocate(self, names, inventory, cash, agent=None):
+        """
+        Add rows for len(names) owners; returns the first owner id.
+
+        `agent`, if given, owns the rows and is unbound on clear().
+        """
+        n = len(names)
+        start = self.size
+        if start + n > len(self.inventory):
+            self._grow(start + n)
+
+        self.inventory[start:start + n] = inventory
+        self.cash[start:start + n] = cash
+        self.initial_cash[start:start + n] = cash
+        self.names.extend(names)
+        self.groups.append((agent.agent_id if agent is not None else names[0], start))
+        if agent is not None:
+            self.agents.append(agent)
+        self.size += n
+        return start
+
+    def clear(self):
+        # Drop every row but keep the allocated arrays. Bound agents get
+        # their positions back and stop reading the registry.
+        for agent in self.agents:
+            agent.unbind_state()
+        self.agents.clear()
+        self.groups.clear()
+        self.size = 0
+        self.names.clear()
+
+    def apply_fill(self, owner, side, price, qty):
+        if side == "BUY":
+            self.inventory[owner] += qty
+            self.cash[owner] -= price * qty
+        else:
+            self.inventory[owner] -= qty
+            self.cash[owner] += price * qty
+
+    def positions(self):
+        return self.inventory[:self.size].copy()
+
+    def group_positions(self):
+        # (labels, positions) with one summed entry per allocate call
+        labels = [label for label, _ in self.groups]
+        if not labels:
+            return labels, np.zeros(0, dtype=np.int64)
+        starts = [start for _, start in self.groups]
+        return labels, np.add.reduceat(self.inventory[:self.size], starts)
+
+    def mark_to_market(self, price):
+        return self.cash[:self.size] + self.inventory[:self.size] * price
+
+    def pnl(self, price):
+        return self.mark_to_market(price) - self.initial_cash[:self.size]
@@ -1,41 +1,118 @@
+import math
 import random
 from abc import ABC, abstractmethod
-from actions import PlaceLimit, PlaceMarket, Cancel
-from collections import deque
-from stable_baselines3 import PPO
+from actions import PlaceLimit, PlaceMarket, Cancel, ReplaceQuotes
+from indicators import RollingSMA
+from order_manager import QuoteManager
+from numpy_policy import load_policy
+from observation import ObservationEncoder
 import numpy as np
 # Removed arrival probability as large arrival rate also have same simulation effect
 
 class Agent(ABC):
+    slots = 1  # owner ids reserved in the engine, one per trader
+    rng = random  # global stream by default; set a random.Random for an isolated one
+
     def __init__(self, agent_id, arrival_rate=1.0):
         self.agent_id = agent_id
         self.arrival_rate = arrival_rate
-        self.balance = 0.0
-        self.inventory = 0
+        self._state = None  # AgentStateRegistry once added to an engine
+        self._balance = 0.0
+        self._inventory = 0
         self.active_orders = {}
+        self.uid = None  # integer id assigned by MarketEngine.add_agent
+
+    # Inventory and balance live in the engine's AgentStateRegistry once
+    # the agent is registered, and on the agent itself before that.
+
+    @property
+    def inventory(self):
+        if self._state is None:
+            return self._inventory
+        return int(self._state.inventory[self.uid])
+
+    @inventory.setter
+    def inventory(self, value):
+        if self._state is None:
+            self._inventory = value
+        else:
+            self._state.inventory[self.uid] = value
+
+    @property
+    def balance(self):
+        if self._state is None:
+            return self._balance
+        return float(self._state.cash[self.uid])
+
+    @balance.setter
+    def balance(self, value):
+        if self._state is None:
+            self._balance = value
+        else:
+            self._state.cash[self.uid] = value
+
+    def bind_state(self, state):
+        # Move our position into the registry; returns our owner id
+        uid = state.allocate([self.agent_id], self.inventory, self.balance, agent=self)
+        self.uid = uid
+        self._state = state
+        return uid
+
+    def unbind_state(self):
+        # Copy our position back out of the registry before it is cleared
+        self._inventory, self._balance = self.inventory, self.balance
+        self._state = None
+        self.uid = None
 
     def next_event_time(self, current_time):
-        return current_time + random.expovariate(self.arrival_rate)
+        return current_time + self.rng.expovariate(self.arrival_rate)
 
     @abstractmethod
     def get_action(self, market_state):
         pass
 
     def on_trade(self, trade, side):
+        # Hook for strategy state; accounting is done by the registry
         pass
 
+    def on_fill(self, trade, side, order):
+        # Called by the engine for every fill of one of our orders,
+        # after the registry has booked it
+        self.on_trade(trade, side)
+        self._track_fill(order, trade.qty)
+
+    def _track_fill(self, order, qty):
+        remaining = self.active_orders.get(order.order_id)
+        if remaining is not None:
+            remaining -= qty
+            if remaining <= 0:
+                del self.active_orders[order.order_id]
+            else:
+                self.active_orders[order.order_id] = remaining
+
+
+class ExternalAgent(Agent):
+    """
+    Agent whose orders are sent from outside the event loop, such as the
+    RL policy in TradingEnv. It owns a registry row so its fills are
+    booked like anyone else's, but is never scheduled to arrive.
+    """
+
+    def get_action(self, market_state):
+        return None
+
 
 class RandomAgent(Agent):
     def get_action(self, market_state):
-        side = random.choice(["BUY", "SELL"])
+        side = self.rng.choice(["BUY", "SELL"])
 
-        if random.random() < 0.5:
-            qty = random.randint(1, 5)
+        if self.rng.random() < 0.5:
+            qty = self.rng.randint(1, 5)
             return PlaceMarket(side, qty)
 
         ref = market_state["mid"] if market_state["mid"] is not None else 100
-        price = ref + random.choice([-2, -1, 1, 2])
-        qty = random.randint(1, 5)
+        price = ref + self.rng.choice([-2, -1, 1, 2])
+        qty = self.rng.randint(1, 5)
 
         return PlaceLimit(side, price, qty)
 
@@ -48,13 +125,17 @@ class MarketMakerAgent(Agent):
         base_spread=1.0,
         inventory_skew=0.1,
         max_inventory=20,
-        cash=100_000
+        cash=100_000,
+        diff_quotes=False,
     ):
         super().__init__(agent_id, arrival_rate)
         self.base_spread = base_spread
         self.inventory_skew = inventory_skew
         self.max_inventory = max_inventory
         self.balance = cash
+        # With diff_quotes only changed quotes are cancelled or amended;
+        # otherwise every arrival cancels and re-places both quotes
+        self.quotes = QuoteManager(self) if diff_quotes else None
 
     def get_action(self, market_state):
         mid = market_state["mid"]
@@ -77,6 +158,14 @@ class MarketMakerAgent(Agent):
             bid = mid - self.base_spread / 2 - skew
             ask = mid + self.base_spread / 2 + skew
 
+        qty = 1
+
+        if self.quotes is not None:
+            return self.quotes.update({
+                "BUY": (bid, qty) if self.inventory < self.max_inventory else None,
+                "SELL": (ask, qty) if self.inventory > -self.max_inventory else None,
+            }, market_state["tick_size"])
+
         actions = []
 
         # Cancel old quotes
@@ -85,8 +174,6 @@ class MarketMakerAgent(Agent):
             del self.active_orders[oid]
 
         # Place new quotes
-        qty = 1
-
         if self.inventory < self.max_inventory:
             actions.append(PlaceLimit("BUY", bid, qty))
 
@@ -95,13 +182,59 @@ class MarketMakerAgent(Agent):
 
         return actions
 
-    def on_trade(self, trade, side):
-        if side == "BUY":
-            self.inventory += trade.qty
-            self.balance -= trade.price * trade.qty
-        else:
-            self.inventory -= trade.qty
-            self.balance += trade.price * trade.qty
+
+class LadderMarketMakerAgent(Agent):
+    """
+    Market maker quoting `levels` price levels per side.
+
+    Each refresh replaces both ladders with one ReplaceQuotes action,
+    i.e. one engine event per refresh instead of one per order. The top
+    of each ladder is snapped outwards to the tick grid and levels are
+    spaced in whole ticks, so every level lands on its own tick.
+    """
+
+    def __init__(
+        self,
+        agent_id,
+        arrival_rate=1.0,
+        levels=10,
+        level_spacing=1.0,
+        qty_per_level=1,
+        base_spread=2.0,
+        inventory_skew=0.1,
+        max_inventory=50,
+        cash=100_000,
+    ):
+        super().__init__(agent_id, arrival_rate)
+        self.levels = levels
+        self.level_spacing = level_spacing
+        self.qty_per_level = qty_per_level
+        self.base_spread = base_spread
+        self.inventory_skew = inventory_skew
+        self.max_inventory = max_inventory
+        self.balance = cash
+        self.ladder = {"BUY": [], "SELL": []}  # live order ids, set by QuoteUpdateEvent
+
+    def get_action(self, market_state):
+        mid = market_state["mid"]
+        if mid is None:
+            mid = 100.0
+
+        tick = market_state["tick_size"]
+        skew = self.inventory_skew * self.inventory
+        bid = math.floor((mid - self.base_spread / 2 - skew) / tick) * tick
+        ask = math.ceil((mid + self.base_spread / 2 - skew) / tick) * tick
+        step = max(1, round(self.level_spacing / tick)) * tick
+
+        bids, asks = [], []
+
+        if self.inventory < self.max_inventory:
+            bids = [(bid - k * step, self.qty_per_level) for k in range(self.levels)]
+
+        if self.inventory > -self.max_inventory:
+            asks = [(ask + k * step, self.qty_per_level) for k in range(self.levels)]
+
+        return ReplaceQuotes(bids, asks)
 
 
 # no inventory updates
@@ -116,8 +249,8 @@ class NoiseTraderAgent(Agent):
         self.max_qty = max_qty
 
     def get_action(self, market_state):
-        side = random.choice(["BUY", "SELL"])
-        qty = random.randint(1, self.max_qty)
+        side = self.rng.choice(["BUY", "SELL"])
+        qty = self.rng.randint(1, self.max_qty)
 
         fv = self.fair_value.get()
 
@@ -128,20 +261,139 @@ class NoiseTraderAgent(Agent):
             return None
 
         # 70% market, 30% aggressive limit
-        if random.random() < 0.7:
+        if self.rng.random() < 0.7:
             return PlaceMarket(side, qty)
 
         # Aggressive limit near fair value
-        price = fv + random.randint(-4, 4)
+        price = fv + self.rng.randint(-4, 4)
         return PlaceLimit(side, price, qty)
-    
-    def on_trade(self, trade, side):
-        if side == "BUY":
-            self.inventory += trade.qty
-            self.balance -= trade.price * trade.qty
-        else:
-            self.inventory -= trade.qty
-            self.balance += trade.price * trade.qty
+
+
+class NoiseTraderPopulation(Agent):
+    """
+    N zero-intelligence noise traders simulated as one array agent.
+
+    Inventory, balance and next arrival time of every trader live in
+    NumPy arrays. Every batch_interval the population draws actions for
+    all traders that arrived since the last batch in one vectorized pass,
+    using the same rules as NoiseTraderAgent, and submits the resulting
+    orders through the normal environment path. A trader can arrive
+    several times within one batch.
+
+    The crowd draws from its own np.random.default_rng(seed), so pass the
+    simulation seed for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        agent_id,
+        fair_value_process,
+        n_traders,
+        seed,
+        arrival_rate=1.0,
+        max_qty=5,
+        cash=10_000,
+        inventory=10,
+        batch_interval=0.1,
+    ):
+        super().__init__(agent_id, arrival_rate)
+        self.slots = n_traders
+        self.fair_value = fair_value_process
+        self.max_qty = max_qty
+        self.batch_interval = batch_interval
+        self.rng = np.random.default_rng(seed)
+
+        self._balances = np.full(n_traders, float(cash))
+        self._inventories = np.full(n_traders, inventory, dtype=np.int64)
+        self.next_arrivals = self.rng.exponential(1.0 / arrival_rate, n_traders)
+        self.clock = 0.0
+
+    # Per-trader positions: rows uid .. uid + n_traders of the registry
+
+    @property
+    def inventories(self):
+        if self._state is None:
+            return self._inventories
+        return self._state.inventory[self.uid:self.uid + self.slots]
+
+    @property
+    def balances(self):
+        if self._state is None:
+            return self._balances
+        return self._state.cash[self.uid:self.uid + self.slots]
+
+    # Aggregate position of the whole crowd
+
+    @property
+    def inventory(self):
+        return int(self.inventories.sum())
+
+    @inventory.setter
+    def inventory(self, value):
+        raise AttributeError("Population inventory is the sum of the trader rows; set inventories instead")
+
+    @property
+    def balance(self):
+        return float(self.balances.sum())
+
+    @balance.setter
+    def balance(self, value):
+        raise AttributeError("Population balance is the sum of the trader rows; set balances instead")
+
+    def bind_state(self, state):
+        names = [f"{self.agent_id}.{i}" for i in range(self.slots)]
+        uid = state.allocate(names, self._inventories, self._balances, agent=self)
+        self.uid = uid
+        self._state = state
+        return uid
+
+    def unbind_state(self):
+        self._inventories = self.inventories.copy()
+        self._balances = self.balances.copy()
+        self._state = None
+        self.uid = None
+
+    def next_event_time(self, current_time):
+        self.clock = current_time + self.batch_interval
+        return self.clock
+
+    def get_action(self, market_state):
+        rng = self.rng
+        next_arrivals = self.next_arrivals
+
+        # Every arrival since the last batch, repeats included
+        arrived = []
+        due = np.flatnonzero(next_arrivals <= self.clock)
+        while due.size:
+            arrived.append(due)
+            next_arrivals[due] += rng.exponential(1.0 / self.arrival_rate, due.size)
+            due = due[next_arrivals[due] <= self.clock]
+        if not arrived:
+            return None
+
+        due = np.concatenate(arrived)
+        n = due.size
+
+        buy = rng.random(n) < 0.5
+        qty = rng.integers(1, self.max_qty + 1, n)
+        market = rng.random(n) < 0.7
+        offsets = rng.integers(-4, 5, n)
+
+        fv = self.fair_value.get()
+
+        # Budget / inventory constraints
+        ok = np.where(buy, self.balances[due] >= fv * qty, self.inventories[due] >= qty)
+
+        actions = []
+        for i in np.flatnonzero(ok):
+            side = "BUY" if buy[i] else "SELL"
+            slot = int(due[i])
+            if market[i]:
+                actions.append(PlaceMarket(side, int(qty[i]), slot=slot))
+            else:
+                actions.append(PlaceLimit(side, fv + int(offsets[i]), int(qty[i]), slot=slot))
+
+        return actions
 
 class MomentumAgent(Agent):
     # Trend following momentum trader using SMA crossover
@@ -156,7 +408,7 @@ class MomentumAgent(Agent):
     ):
         super().__init__(agent_id, arrival_rate)
         self.window = window
-        self.prices = deque(maxlen=window)
+        self.sma = RollingSMA(window)
         self.balance = cash
         self.inventory = 0
         self.max_qty = max_qty
@@ -167,15 +419,13 @@ class MomentumAgent(Agent):
         if mid is None:
             return None
 
-        self.prices.append(mid)
+        sma = self.sma.update(mid)
 
-        if len(self.prices) < self.window:
+        if sma is None:
             return None # Not enough history
 
-        sma = sum(self.prices) / self.window
-
         side = "BUY" if mid > sma else "SELL"
-        qty = random.randint(1, self.max_qty)
+        qty = self.rng.randint(1, self.max_qty)
 
         # Budget / inventory constraints
         if side == "BUY" and self.balance < mid * qty:
@@ -186,14 +436,7 @@ class MomentumAgent(Agent):
 
         # Momentum traders are aggressive
         return PlaceMarket(side, qty)
-    
-    def on_trade(self, trade, side):
-        if side == "BUY":
-            self.inventory += trade.qty
-            self.balance -= trade.price * trade.qty
-        else:
-            self.inventory -= trade.qty
-            self.balance += trade.price * trade.qty
+
 
 class PPOAgent(Agent):
     """
@@ -204,73 +447,71 @@ class PPOAgent(Agent):
     def __init__(
         self,
         agent_id,
-        model_path,
+        model_path=None,
         arrival_rate=1.0,
         max_inventory=20,
         cash=100_000,
+        service=None,
+        features=None,
     ):
+        if model_path is None and service is None:
+            raise ValueError("PPOAgent needs a model_path or a service")
         self.agent_id = agent_id
         super().__init__(agent_id, arrival_rate)
-        self.model = PPO.load(model_path)
+        # With a shared PolicyInferenceService the model lives there and
+        # decisions are batched with other PPO agents
+        self.service = service
+        # model_path may point at a torch-free .npz export (numpy_policy.py)
+        self.model = load_policy(model_path) if service is None else None
         self.inventory = 0
         self.balance = cash
         self.max_inventory = max_inventory
+        self.encoder = ObservationEncoder(depth=5, max_inventory=max_inventory, max_cash=100_000)
+        # MicrostructureFeatures attached to the engine's book, for
+        # policies trained with TradingEnv(features=True)
+        self.features = features
+        if features is not None:
+            self._obs = np.zeros(self.encoder.size + features.size, dtype=np.float32)
 
     # Observation adapter
     def _build_obs(self, market_state):
         """
-        Convert market_state dict -> PPO observation vector.
+        Convert market_state -> PPO observation vector.
 
-        This MUST match TradingEnv._normalize_obs() semantics
-        approximately, not exactly.
+        Uses the same ObservationEncoder as TradingEnv, so the layout
+        matches training exactly. The returned array is a reusable
+        buffer.
         """
-
-        bids = market_state["l2"].bids[:5]
-        asks = market_state["l2"].asks[:5]
-
         mid = market_state["mid"]
         if mid is None:
             mid = 100.0
 
-        def pad(levels):
-            while len(levels) < 5:
-                levels.append((mid, 0))
-            return levels
-
-        bids = pad(bids)
-        asks = pad(asks)
+        if self.features is None:
+            return self.encoder.encode(market_state["l2"], mid, self.inventory, self.balance)
 
-        bid_prices = [(mid - p) / mid for p, q in bids]
-        bid_sizes = [q / 100_000 for p, q in bids]
-
-        ask_prices = [(p - mid) / mid for p, q in asks]
-        ask_sizes = [q / 100_000 for p, q in asks]
-
-        norm_inventory = (self.inventory + self.max_inventory) / (2 * self.max_inventory)
-        norm_cash = self.balance / 100_000
-
-        obs = np.array(
-            bid_prices
-            + bid_sizes
-            + ask_prices
-            + ask_sizes
-            + [norm_inventory, norm_cash],
-            dtype=np.float32,
-        )
-
-        return np.clip(obs, 0.0, 1.0)
+        n = self.encoder.size
+        self.encoder.encode(market_state["l2"], mid, self.inventory, self.balance, out=self._obs[:n])
+        self.features.vector(out=self._obs[n:])
+        return self._obs
 
 
     # Market action adapter
     def get_action(self, market_state):
         obs = self._build_obs(market_state)
 
-        action, _ = self.model.predict(obs, deterministic=True)
-
         mid = market_state["mid"]
         if mid is None:
             mid = 100.0
 
+        if self.service is not None:
+            # Decision is applied when the service runs its next batch
+            self.service.submit(self, obs, mid)
+            return None
+
+        action, _ = self.model.predict(obs, deterministic=True)
+        return self.map_action(action, mid)
+
+    def map_action(self, action, mid):
         # Action mapping (same as TradingEnv)
         # 0 = Hold
         # 1 = Buy
@@ -283,12 +524,3 @@ class PPOAgent(Agent):
             return PlaceMarket("SELL", qty=1)
 
         return None
-
-    # Trade callback
-    def on_trade(self, trade, side):
-        if side == "BUY":
-            self.inventory += trade.qty
-            self.balance -= trade.price * trade.qty
-        else:
-            self.inventory -= trade.qty
-            self.balance += trade.price * trade.qty
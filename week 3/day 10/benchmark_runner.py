@@ -1,11 +1,7 @@
 import os
 import pandas as pd
 
-from evaluate_rl_agent import evaluate_rl_agent
-from evaluate_baselines import (
-    evaluate_buy_and_hold,
-    evaluate_random_agent,
-)
+from evaluate_batched import evaluate_all
 from metrics import aggregate_metrics
 from plots import plot_equity_curves, plot_drawdown_curves
 
@@ -17,11 +13,9 @@ def main():
     SEED = 42
     MODEL_PATH = "ppo_trading_agent"
 
-    results = {
-        "RL Agent": evaluate_rl_agent(MODEL_PATH, N_EPISODES, SEED),
-        "Buy & Hold": evaluate_buy_and_hold(N_EPISODES, SEED),
-        "Random": evaluate_random_agent(N_EPISODES, SEED),
-    }
+    # All episodes of all policies run side by side in one vectorized
+    # env; same price paths as evaluate_rl_agent / evaluate_baselines
+    results = evaluate_all(MODEL_PATH, N_EPISODES, SEED)
 
     metrics = {}
     for agent, runs in results.items():
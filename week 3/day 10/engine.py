@@ -1,14 +1,44 @@
 import heapq
+from order_book import FILL
+from agent_state import AgentStateRegistry
 
 class MarketEngine:
-    def __init__(self, order_book, logger):
+    def __init__(self, order_book, logger, journal=None):
         self.order_book = order_book
         self.logger = logger
+        self.journal = journal  # optional EventJournal
         self.time = 0
         self.event_queue = []
         self.seq = 0
         self.running = True
         self.agents = {}
+        self.owners = []  # integer owner id -> agent
+        self.state = AgentStateRegistry()  # inventory / cash by owner id
+
+        order_book.subscribe(FILL, logger.on_fill)
+        order_book.subscribe(FILL, self._dispatch_fill)
+
+    def reset(self):
+        """
+        Return the engine, its order book and logger to an empty state
+        without reallocating them. Book subscriptions are kept.
+        """
+        self.time = 0
+        self.event_queue.clear()
+        self.seq = 0
+        self.running = True
+        self.agents.clear()
+        self.owners.clear()
+        self.state.clear()
+        self.order_book.clear()
+        self.logger.clear()
+
+    def add_agent(self, agent):
+        # Population agents reserve one owner id per trader they represent
+        agent.bind_state(self.state)
+        self.owners.extend([agent] * agent.slots)
+        self.agents[agent.agent_id] = agent
+        return agent.uid
 
     def schedule(self, event):
         heapq.heappush(
@@ -22,3 +52,29 @@ class MarketEngine:
             event_time, _, event = heapq.heappop(self.event_queue)
             self.time = event_time
             event.execute(self)
+
+    def run_until(self, t):
+        # Execute only the events due by time t, then move the clock to t.
+        # Lets a caller advance the market in fixed slices.
+        queue = self.event_queue
+        while queue and self.running and queue[0][0] <= t:
+            event_time, _, event = heapq.heappop(queue)
+            self.time = event_time
+            event.execute(self)
+        if self.running and t > self.time:
+            self.time = t
+
+    def _dispatch_fill(self, trade, maker, taker):
+        if taker.side == "BUY":
+            self._fill_owner(trade, taker, "BUY")
+            self._fill_owner(trade, maker, "SELL")
+        else:
+            self._fill_owner(trade, maker, "BUY")
+            self._fill_owner(trade, taker, "SELL")
+
+    def _fill_owner(self, trade, order, side):
+        if order.owner is None:
+            return
+
+        self.state.apply_fill(order.owner, side, trade.price, trade.qty)
+        self.owners[order.owner].on_fill(trade, side, order)
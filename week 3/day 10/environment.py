@@ -1,60 +1,217 @@
 import random
-from events import OrderSubmissionEvent
+from collections.abc import Mapping
+from events import OrderSubmissionEvent, QuoteUpdateEvent
 from order import Order
-from actions import PlaceLimit, PlaceMarket, Cancel
+from actions import PlaceLimit, PlaceMarket, Cancel, Amend, ReplaceQuotes
+
+class MarketState(Mapping):
+    """
+    Read-only, lazily evaluated view of the book for one agent arrival.
+
+    Supports the same keys as the old market_state dict
+    ("best_bid", "best_ask", "mid", "l2"). Each field is computed on
+    first access and cached, so agents only pay for what they read.
+    "tick_size" is the price grid the environment rounds orders to.
+    """
+
+    KEYS = ("best_bid", "best_ask", "mid", "l2", "tick_size")
+
+    __slots__ = ("_book", "_cache")
+
+    def __init__(self, order_book, tick_size=1):
+        self._book = order_book
+        self._cache = {"tick_size": tick_size}
+
+    def __getitem__(self, key):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        if key == "best_bid":
+            bids = self._book.bids
+            value = -bids[0][0] if bids else None
+        elif key == "best_ask":
+            asks = self._book.asks
+            value = asks[0][0] if asks else None
+        elif key == "mid":
+            bid, ask = self["best_bid"], self["best_ask"]
+            value = (bid + ask) / 2 if bid is not None and ask is not None else None
+        elif key == "l2":
+            value = self._book.current_snapshot()
+        else:
+            raise KeyError(key)
+
+        self._cache[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
 
 class MarketEnvironment:
-    def __init__(self, engine, config):
+    def __init__(self, engine, config, rng=None):
         self.engine = engine
         self.config = config
+        self.rng = rng if rng is not None else random  # latency draws
+        self._state = None
+        self._state_key = None
+        self._last_order_id = None
+        self._repeats = 0
+        # Limit orders sent but not yet in the book, by order id. Cancels
+        # and amends reach them here, so a quote in flight never ends up
+        # resting untracked or gets the same amend again on every arrival.
+        self.in_flight = {}
+
+    def reset(self):
+        self._state = None
+        self._state_key = None
+        self._last_order_id = None
+        self._repeats = 0
+        self.in_flight.clear()
 
     def get_market_state(self):
-        snapshot = self.engine.order_book.current_snapshot()
-        return {
-            "best_bid": snapshot.best_bid(),
-            "best_ask": snapshot.best_ask(),
-            "mid": (
-                (snapshot.best_bid() + snapshot.best_ask()) / 2
-                if snapshot.best_bid() is not None and snapshot.best_ask() is not None
-                else None
-            ),
-            "l2": snapshot
-        }
+        # Reuse the view while neither the clock nor the book has moved
+        book = self.engine.order_book
+        key = (self.engine.time, book.version)
+        if key != self._state_key:
+            self._state = MarketState(book, self.config.tick_size)
+            self._state_key = key
+        return self._state
+
+    def _order_identity(self, agent, action):
+        # Population agents trade for many traders; each gets its own
+        # owner id and order id prefix
+        if agent.slots == 1:
+            order_id, owner = f"{agent.agent_id}-{self.engine.time}", agent.uid
+        else:
+            owner = agent.uid + action.slot if agent.uid is not None else None
+            order_id = f"{agent.agent_id}.{action.slot}-{self.engine.time}"
+
+        # Several orders from one arrival (e.g. both quotes) need distinct ids
+        if order_id == self._last_order_id:
+            self._repeats += 1
+            return f"{order_id}#{self._repeats}", owner
+
+        self._last_order_id = order_id
+        self._repeats = 0
+        return order_id, owner
 
     def apply_action(self, agent, action):
         if action is None:
             return
 
         if isinstance(action, PlaceLimit):
+            order_id, owner = self._order_identity(agent, action)
             order = Order(
-                order_id=f"{agent.agent_id}-{self.engine.time}",
+                order_id=order_id,
                 side=action.side,
                 price=round(action.price / self.config.tick_size) * self.config.tick_size,
                 qty=max(self.config.lot_size, action.qty),
                 timestamp=0,
+                owner=owner,
             )
 
         elif isinstance(action, PlaceMarket):
+            order_id, owner = self._order_identity(agent, action)
             order = Order(
-                order_id=f"{agent.agent_id}-{self.engine.time}",
+                order_id=order_id,
                 side=action.side,
                 price=None,
                 qty=max(self.config.lot_size, action.qty),
                 timestamp=0,
+                owner=owner,
             )
 
         elif isinstance(action, Cancel):
-            self.engine.order_book.cancel(action.order_id)
+            # Cancels are instantaneous; one for an order still in flight
+            # stops it from ever reaching the book
+            if self.in_flight.pop(action.order_id, None) is None:
+                if self.engine.order_book.cancel(action.order_id) and self.engine.journal is not None:
+                    self.engine.journal.record_cancel(self.engine.time, action.order_id)
             agent.active_orders.pop(action.order_id, None)
             return
 
+        elif isinstance(action, Amend):
+            # Like cancels, amends are instantaneous. An amend of an order
+            # in flight resizes it before it arrives; otherwise it only
+            # reaches orders resting in the book and is journaled if it did
+            pending = self.in_flight.get(action.order_id)
+            if pending is not None:
+                if action.qty > 0:
+                    pending.qty = action.qty
+                else:
+                    del self.in_flight[action.order_id]
+                applied = True
+            else:
+                applied = self.engine.order_book.amend(action.order_id, action.qty, self.engine.time)
+                if applied and self.engine.journal is not None:
+                    self.engine.journal.record_amend(self.engine.time, action.order_id, action.qty)
+
+            if applied and action.qty > 0:
+                agent.active_orders[action.order_id] = action.qty
+            else:
+                agent.active_orders.pop(action.order_id, None)
+            return
+
+        elif isinstance(action, ReplaceQuotes):
+            self._replace_quotes(agent, action)
+            return
+
         else:
             return
 
-        latency = random.expovariate(1.0 / self.config.mean_latency)
+        latency = self.rng.expovariate(1.0 / self.config.mean_latency)
         arrival_time = self.engine.time + latency
 
-        self.engine.schedule(OrderSubmissionEvent(arrival_time, order))
+        action.order_id = order.order_id  # lets agents track what they placed
 
         if isinstance(action, PlaceLimit):
             agent.active_orders[order.order_id] = order.qty
+            self.in_flight[order.order_id] = order
+            self.engine.schedule(OrderSubmissionEvent(arrival_time, order, self.in_flight))
+        else:
+            self.engine.schedule(OrderSubmissionEvent(arrival_time, order))
+
+    def _replace_quotes(self, agent, action):
+        # Both ladders travel as one engine event with one latency draw,
+        # so the new ladder on one side never meets the agent's stale
+        # ladder on the other
+        base_id, owner = self._order_identity(agent, action)
+        tick = self.config.tick_size
+
+        ladders = {}
+        for side, levels in (("BUY", action.bids), ("SELL", action.asks)):
+            # Guard against duplicate prices: orders in one ladder share
+            # a timestamp and must not tie on price in the heap
+            merged = {}
+            for price, qty in levels:
+                price = round(price / tick) * tick
+                merged[price] = merged.get(price, 0) + max(self.config.lot_size, qty)
+            ladders[side] = merged
+
+        # Never quote through our own opposite ladder
+        if ladders["BUY"] and ladders["SELL"]:
+            best_ask = min(ladders["SELL"])
+            ladders["BUY"] = {p: q for p, q in ladders["BUY"].items() if p < best_ask}
+
+        orders = {
+            side: [
+                Order(
+                    order_id=f"{base_id}-{side[0]}{level}",
+                    side=side,
+                    price=price,
+                    qty=qty,
+                    timestamp=0,
+                    owner=owner,
+                )
+                for level, (price, qty) in enumerate(levels.items())
+            ]
+            for side, levels in ladders.items()
+        }
+
+        latency = self.rng.expovariate(1.0 / self.config.mean_latency)
+        self.engine.schedule(QuoteUpdateEvent(self.engine.time + latency, agent, orders))
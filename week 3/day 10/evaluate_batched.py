@@ -0,0 +1,91 @@
+import numpy as np
+
+from numpy_policy import load_policy
+from vec_trading_env import VecTradingEnv
+
+# Batched evaluation
+#
+# Every episode of every policy runs as one row of a single VecTradingEnv.
+# Episode ep uses the same price path as TradingEnv(seed=seed + ep), so
+# the results match the one-episode-at-a-time evaluators in
+# evaluate_rl_agent.py / evaluate_baselines.py, and each step is one
+# batched policy call per policy instead of one call per episode.
+
+
+def rl_policy(model_path):
+    model = load_policy(model_path)  # SB3/torch only imported for .zip models
+
+    def act(obs, t):
+        action, _ = model.predict(obs, deterministic=True)
+        return action
+
+    return act
+
+
+def buy_and_hold_policy(obs, t):
+    # Buy once at t=0
+    return np.full(len(obs), 1 if t == 0 else 0)
+
+
+def random_policy(seed):
+    rng = np.random.default_rng(seed)
+
+    def act(obs, t):
+        return rng.integers(0, 3, len(obs))
+
+    return act
+
+
+def run_episodes(policies, n_episodes, seed, **env_kwargs):
+    """
+    policies maps a name to act(obs_batch, t) -> actions.
+
+    Returns {name: [portfolio values per step, one list per episode]}.
+    """
+    names = list(policies)
+    n = len(names) * n_episodes
+    seeds = [seed + ep for ep in range(n_episodes)] * len(names)
+
+    env = VecTradingEnv(n_envs=n, episode_seeds=seeds, **env_kwargs)
+    obs = env.reset()
+
+    values = np.full((n, env.max_steps), np.nan)
+    lengths = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+    actions = np.zeros(n, dtype=np.int64)
+
+    for t in range(env.max_steps):
+        for k, name in enumerate(names):
+            rows = slice(k * n_episodes, (k + 1) * n_episodes)
+            actions[rows] = policies[name](obs[rows], t)
+
+        obs, _, dones, _ = env.step(actions)
+
+        values[active, t] = env.portfolio_value[active]
+        lengths[active] += 1
+        active &= ~dones
+        if not active.any():
+            break
+
+    env.close()
+
+    results = {}
+    for k, name in enumerate(names):
+        rows = range(k * n_episodes, (k + 1) * n_episodes)
+        results[name] = [values[i, :lengths[i]].tolist() for i in rows]
+    return results
+
+
+def evaluate_all(model_path, n_episodes, seed):
+    results = run_episodes(
+        {
+            "RL Agent": rl_policy(model_path),
+            "Buy & Hold": buy_and_hold_policy,
+            "Random": random_policy(seed),
+        },
+        n_episodes,
+        seed,
+    )
+    # evaluate_buy_and_hold does not record the entry step
+    results["Buy & Hold"] = [values[1:] for values in results["Buy & Hold"]]
+    return results
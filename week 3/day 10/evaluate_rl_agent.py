@@ -1,9 +1,9 @@
 import numpy as np
-from stable_baselines3 import PPO
+from numpy_policy import load_policy
 from TradingEnv import TradingEnv
 
 def evaluate_rl_agent(model_path, n_episodes, seed):
-    model = PPO.load(model_path)
+    model = load_policy(model_path)  # SB3/torch only imported for .zip models
     results = []
 
     for ep in range(n_episodes):
@@ -35,44 +35,52 @@ class MarketCloseEvent(Event):
         engine.running = False
 
 class OrderSubmissionEvent(Event):
-    def __init__(self, time, order):
+    def __init__(self, time, order, in_flight=None):
         super().__init__(time)
         self.order = order
+        # MarketEnvironment.in_flight; an order missing from it on
+        # arrival was cancelled while in flight
+        self.in_flight = in_flight
 
     def execute(self, engine):
-        prev_trades = len(engine.order_book.trades)
+        if self.in_flight is not None and self.in_flight.pop(self.order.order_id, None) is None:
+            return
         self.order.timestamp = engine.time #  Execution time of order and not submission time 
+        if engine.journal is not None:
+            engine.journal.record_submit(engine.time, self.order)
+        # Fills reach the logger and the owning agents through the
+        # order book's FILL subscribers
         engine.order_book.submit(self.order)
 
-        for t in engine.order_book.trades[prev_trades:]:
-            engine.logger.record_trade(t)
-
-            buy_id = t.buy_order_id.split("-")[0]
-            sell_id = t.sell_order_id.split("-")[0]
-
-            if buy_id in engine.agents:
-                agent = engine.agents[buy_id]
-                agent.on_trade(t, "BUY")
-
-                remaining = agent.active_orders.get(t.buy_order_id)
-                if remaining is not None:
-                    remaining -= t.qty
-                    if remaining <= 0:
-                        del agent.active_orders[t.buy_order_id]
-                    else:
-                        agent.active_orders[t.buy_order_id] = remaining
-
-            if sell_id in engine.agents:
-                agent = engine.agents[sell_id]
-                agent.on_trade(t, "SELL")
-                
-                remaining = agent.active_orders.get(t.sell_order_id)
-                if remaining is not None:
-                    remaining -= t.qty
-                    if remaining <= 0:
-                        del agent.active_orders[t.sell_order_id]
-                    else:
-                        agent.active_orders[t.sell_order_id] = remaining
+
+class QuoteUpdateEvent(Event):
+    # Atomically swaps an agent's ladders on both sides of the book
+
+    def __init__(self, time, agent, orders):
+        super().__init__(time)
+        self.agent = agent
+        self.orders = orders  # side -> new orders
+
+    def execute(self, engine):
+        agent = self.agent
+        cancel_ids = agent.ladder["BUY"] + agent.ladder["SELL"]
+        orders = self.orders["BUY"] + self.orders["SELL"]
+
+        for order_id in cancel_ids:
+            agent.active_orders.pop(order_id, None)
+        for order in orders:
+            order.timestamp = engine.time
+            agent.active_orders[order.order_id] = order.qty
+
+        if engine.journal is not None:
+            for order_id in cancel_ids:
+                engine.journal.record_cancel(engine.time, order_id)
+            for order in orders:
+                engine.journal.record_submit(engine.time, order)
+
+        for side, side_orders in self.orders.items():
+            agent.ladder[side] = [order.order_id for order in side_orders]
+        engine.order_book.replace_orders(cancel_ids, orders)
 
 
 class SnapshotEvent(Event):
@@ -96,9 +104,9 @@ class SnapshotEvent(Event):
                 snapshot.asks[:self.depth]
             )
 
-        for agent in engine.agents.values():
-            if hasattr(agent, "inventory"):
-                engine.logger.record_inventory(engine.time, agent.agent_id, agent.inventory)
+        # One row per agent; population agents are summed over their traders
+        agent_ids, positions = engine.state.group_positions()
+        engine.logger.record_inventory(engine.time, agent_ids, positions)
 
         if engine.running:
             engine.schedule(
@@ -115,6 +123,17 @@ class FairValueUpdateEvent(Event):
 
     def execute(self, engine):
         self.fv.step()
+        if engine.journal is not None:
+            engine.journal.record_fair_value(engine.time, self.fv.get())
         engine.schedule(
             FairValueUpdateEvent(engine.time + self.dt, self.fv, self.dt)
         )
+
+
+class PolicyBatchEvent(Event):
+    def __init__(self, time, service):
+        super().__init__(time)
+        self.service = service
+
+    def execute(self, engine):
+        self.service.flush()
@@ -2,10 +2,19 @@ import pandas as pd
 
 from run_simulation import run_simulation
 
+# Set to a directory to stream the simulation logs to chunked Parquet
+# files and scan them back, instead of keeping them in memory
+LOG_DIR = None
+
 # --------------------------------------------------
 # 1. Run Day 10 simulation ONCE
 # --------------------------------------------------
-logger = run_simulation(42, 500.0)
+if LOG_DIR is None:
+    logger = run_simulation(42, 500.0)
+else:
+    from log_sink import ChunkedSink, LogReader
+    run_simulation(42, 500.0, sink=ChunkedSink(LOG_DIR))
+    logger = LogReader(LOG_DIR)
 
 # --------------------------------------------------
 # 2. Load logged data
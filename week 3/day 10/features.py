@@ -0,0 +1,169 @@
+import math
+
+import numpy as np
+
+from indicators import EMA
+from order_book import ADD, CANCEL, AMEND, FILL
+
+
+class MicrostructureFeatures:
+    """
+    Order-flow features kept up to date from OrderBook updates.
+
+    Subscribes to the book's ADD / CANCEL / AMEND / FILL messages and
+    does O(1) work per message, so reading the features never touches
+    the logger or rebuilds a snapshot.
+
+    vector() returns a fixed-width float32 vector in [0, 1]:
+        ofi         order-flow imbalance (EMA of signed queue changes)
+        volatility  EMA volatility of trade-to-trade log returns
+        intensity   traded volume with exponential time decay
+        microprice  microprice position inside the spread (0.5 = mid)
+        imbalance   best bid size / (best bid size + best ask size)
+    Unbounded quantities are squashed with tanh using the *_scale
+    arguments. With an engine, trade intensity is decayed to the
+    engine clock when the vector is read.
+    """
+
+    names = ("ofi", "volatility", "intensity", "microprice", "imbalance")
+    size = len(names)
+
+    def __init__(
+        self,
+        order_book,
+        engine=None,
+        span=50,
+        intensity_halflife=10.0,
+        ofi_scale=10.0,
+        vol_scale=0.05,
+        intensity_scale=50.0,
+    ):
+        self.book = order_book
+        self.engine = engine
+        self.span = span
+        self.intensity_halflife = intensity_halflife
+        self.ofi_scale = ofi_scale
+        self.vol_scale = vol_scale
+        self.intensity_scale = intensity_scale
+        self.buffer = np.zeros(self.size, dtype=np.float32)
+
+        self.reset()
+
+        order_book.subscribe(ADD, self._on_add)
+        order_book.subscribe(CANCEL, self._on_cancel)
+        order_book.subscribe(AMEND, self._on_amend)
+        order_book.subscribe(FILL, self._on_fill)
+
+    def reset(self):
+        # Rebuild level sizes from whatever is resting now (O(book) once)
+        self.levels = {"BUY": {}, "SELL": {}}
+        for order in self.book.orders.values():
+            self._change_level(order.side, order.price, order.qty)
+
+        self.ofi = EMA(span=self.span)
+        self.variance = EMA(span=self.span)
+        self.last_price = None
+        self.intensity = 0.0
+        self.last_trade_time = None
+
+    def close(self):
+        self.book.unsubscribe(ADD, self._on_add)
+        self.book.unsubscribe(CANCEL, self._on_cancel)
+        self.book.unsubscribe(AMEND, self._on_amend)
+        self.book.unsubscribe(FILL, self._on_fill)
+
+    # ------------------------------------------------------------------
+    # book callbacks
+    # ------------------------------------------------------------------
+
+    def _change_level(self, side, price, delta):
+        level = self.levels[side]
+        qty = level.get(price, 0) + delta
+        if qty > 0:
+            level[price] = qty
+        else:
+            level.pop(price, None)
+
+    def _flow(self, side, delta):
+        # Bid liquidity added / ask liquidity removed is buying pressure
+        self.ofi.update(delta if side == "BUY" else -delta)
+
+    def _on_add(self, order):
+        self._change_level(order.side, order.price, order.qty)
+        self._flow(order.side, order.qty)
+
+    def _on_cancel(self, order):
+        self._change_level(order.side, order.price, -order.qty)
+        self._flow(order.side, -order.qty)
+
+    def _on_amend(self, order, old_qty):
+        delta = order.qty - old_qty
+        self._change_level(order.side, order.price, delta)
+        self._flow(order.side, delta)
+
+    def _on_fill(self, trade, maker, taker):
+        self._change_level(maker.side, maker.price, -trade.qty)
+        self._flow(maker.side, -trade.qty)
+
+        if self.last_price is not None:
+            r = math.log(trade.price / self.last_price)
+            self.variance.update(r * r)
+        self.last_price = trade.price
+
+        self.intensity = self._decayed_intensity(taker.timestamp) + trade.qty
+        self.last_trade_time = taker.timestamp
+
+    # ------------------------------------------------------------------
+    # readers
+    # ------------------------------------------------------------------
+
+    def _decayed_intensity(self, now):
+        if self.last_trade_time is None or now is None:
+            return self.intensity
+        dt = max(0.0, now - self.last_trade_time)
+        return self.intensity * 0.5 ** (dt / self.intensity_halflife)
+
+    @property
+    def volatility(self):
+        return math.sqrt(self.variance.value) if self.variance.ready else 0.0
+
+    def top_of_book(self):
+        # (bid, bid_qty, ask, ask_qty), None where a side is empty
+        bids, asks = self.book.bids, self.book.asks
+        bid = -bids[0][0] if bids else None
+        ask = asks[0][0] if asks else None
+        bid_qty = self.levels["BUY"].get(bid, 0) if bid is not None else 0
+        ask_qty = self.levels["SELL"].get(ask, 0) if ask is not None else 0
+        return bid, bid_qty, ask, ask_qty
+
+    def microprice(self):
+        bid, bid_qty, ask, ask_qty = self.top_of_book()
+        if bid is None or ask is None or bid_qty + ask_qty == 0:
+            return None
+        return (bid * ask_qty + ask * bid_qty) / (bid_qty + ask_qty)
+
+    def vector(self, now=None, out=None):
+        """
+        Current features as float32 in [0, 1]; `now` defaults to the
+        engine clock.
+        """
+        if out is None:
+            out = self.buffer
+        if now is None and self.engine is not None:
+            now = self.engine.time
+
+        ofi = self.ofi.value or 0.0
+        out[0] = 0.5 + 0.5 * math.tanh(ofi / self.ofi_scale)
+        out[1] = math.tanh(self.volatility / self.vol_scale)
+        out[2] = math.tanh(self._decayed_intensity(now) / self.intensity_scale)
+
+        bid, bid_qty, ask, ask_qty = self.top_of_book()
+        if bid is not None and ask is not None and bid_qty + ask_qty > 0 and ask > bid:
+            micro = (bid * ask_qty + ask * bid_qty) / (bid_qty + ask_qty)
+            out[3] = (micro - bid) / (ask - bid)
+            out[4] = bid_qty / (bid_qty + ask_qty)
+        else:
+            out[3] = 0.5
+            out[4] = 0.5
+
+        return out
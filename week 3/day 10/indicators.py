@@ -0,0 +1,151 @@
+import math
+from collections import deque
+
+# Incremental technical indicators
+#
+# Every indicator is fed one observation at a time through update() and
+# does O(1) work per observation, whatever the window length. value is
+# None until enough history has been seen.
+
+
+class RollingSMA:
+    # The running sum is recomputed exactly with math.fsum once per
+    # window of updates, so add / subtract rounding error cannot build
+    # up over long runs (still O(1) amortized)
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.value = None
+        self._since_resync = 0
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window
+
+    def update(self, x):
+        self.values.append(x)
+        self.total += x
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self.total = math.fsum(self.values)
+            self._since_resync = 0
+
+        self.value = self.total / self.window if self.ready else None
+        return self.value
+
+
+class EMA:
+    def __init__(self, span=None, alpha=None):
+        if alpha is None:
+            if span is None:
+                raise ValueError("EMA needs either span or alpha")
+            alpha = 2.0 / (span + 1)
+        self.alpha = alpha
+        self.value = None
+
+    @property
+    def ready(self):
+        return self.value is not None
+
+    def update(self, x):
+        if self.value is None:
+            self.value = float(x)
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class RollingVariance:
+    # Sliding-window Welford update (population variance)
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.value = None
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window
+
+    @property
+    def std(self):
+        return math.sqrt(self.value) if self.value is not None else None
+
+    def update(self, x):
+        self.values.append(x)
+        n = len(self.values)
+
+        if n <= self.window:
+            delta = x - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (x - self.mean)
+        else:
+            old = self.values.popleft()
+            old_mean = self.mean
+            self.mean += (x - old) / self.window
+            self.m2 += (x - old) * (x - self.mean + old - old_mean)
+
+        self.m2 = max(self.m2, 0.0)  # guard against rounding drift
+        self.value = self.m2 / self.window if self.ready else None
+        return self.value
+
+
+class ZScore:
+    def __init__(self, window):
+        self.variance = RollingVariance(window)
+        self.value = None
+
+    @property
+    def ready(self):
+        return self.variance.ready
+
+    def update(self, x):
+        self.variance.update(x)
+        std = self.variance.std
+        if std is None or std == 0:
+            self.value = None if std is None else 0.0
+        else:
+            self.value = (x - self.variance.mean) / std
+        return self.value
+
+
+class Crossover:
+    """
+    Tracks the sign of (fast - slow) for two indicators fed the same
+    series. state is +1 when fast is above slow, -1 when below and 0
+    when equal or not yet ready. crossed is True on the update where
+    the state flipped between +1 and -1, including flips that pass
+    through 0 on the way.
+    """
+
+    def __init__(self, fast, slow):
+        self.fast = fast
+        self.slow = slow
+        self.state = 0
+        self.last_side = 0  # last non-zero state
+        self.crossed = False
+
+    @property
+    def ready(self):
+        return self.fast.ready and self.slow.ready
+
+    def update(self, x):
+        fast = self.fast.update(x)
+        slow = self.slow.update(x)
+
+        if fast is None or slow is None or fast == slow:
+            self.state = 0
+        else:
+            self.state = 1 if fast > slow else -1
+
+        self.crossed = self.last_side != 0 and self.state != 0 and self.state != self.last_side
+        if self.state != 0:
+            self.last_side = self.state
+        return self.state
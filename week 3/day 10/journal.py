@@ -0,0 +1,154 @@
+import math
+import struct
+
+from order import Order
+
+# Binary event journal
+#
+# Every record starts with a fixed header (kind, engine time) followed by a
+# kind specific payload. All fields are little endian.
+#
+#   SUBMIT     : side (B), price (d, NaN for market orders), qty (i),
+#                id length (H), order id (utf-8)
+#   CANCEL     : id length (H), order id (utf-8)
+#   FAIR_VALUE : value (d)
+#   AMEND      : qty (i), id length (H), order id (utf-8)
+
+SUBMIT = 1
+CANCEL = 2
+FAIR_VALUE = 3
+AMEND = 4
+
+_HEADER = struct.Struct("<Bd")
+_SUBMIT = struct.Struct("<BdiH")
+_CANCEL = struct.Struct("<H")
+_FAIR_VALUE = struct.Struct("<d")
+_AMEND = struct.Struct("<iH")
+
+_SIDES = ("BUY", "SELL")
+_SIDE_CODES = {"BUY": 0, "SELL": 1}
+
+
+class EventJournal:
+    """
+    Append-only binary log of the events executed by a MarketEngine.
+
+    Records are appended sequentially within one run; an existing file
+    at `path` is replaced unless append=True, so a journal always holds
+    exactly one run and replays deterministically.
+    """
+
+    def __init__(self, path, buffer_size=1 << 16, append=False):
+        self.path = path
+        self.file = open(path, "ab" if append else "wb", buffering=buffer_size)
+        self.records = 0
+
+    def record_submit(self, time, order):
+        order_id = order.order_id.encode()
+        price = math.nan if order.price is None else order.price
+        self.file.write(_HEADER.pack(SUBMIT, time))
+        self.file.write(_SUBMIT.pack(_SIDE_CODES[order.side], price, order.qty, len(order_id)))
+        self.file.write(order_id)
+        self.records += 1
+
+    def record_cancel(self, time, order_id):
+        order_id = order_id.encode()
+        self.file.write(_HEADER.pack(CANCEL, time))
+        self.file.write(_CANCEL.pack(len(order_id)))
+        self.file.write(order_id)
+        self.records += 1
+
+    def record_fair_value(self, time, value):
+        self.file.write(_HEADER.pack(FAIR_VALUE, time))
+        self.file.write(_FAIR_VALUE.pack(value))
+        self.records += 1
+
+    def record_amend(self, time, order_id, qty):
+        order_id = order_id.encode()
+        self.file.write(_HEADER.pack(AMEND, time))
+        self.file.write(_AMEND.pack(qty, len(order_id)))
+        self.file.write(order_id)
+        self.records += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_journal(path):
+    """
+    Yield (kind, time, payload) tuples in recorded order.
+
+    SUBMIT payload is (order_id, side, price, qty), CANCEL payload is
+    the order id, AMEND payload is (order_id, qty) and FAIR_VALUE
+    payload is the new fair value.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    offset = 0
+    end = len(data)
+    while offset < end:
+        kind, time = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+
+        if kind == SUBMIT:
+            side, price, qty, n = _SUBMIT.unpack_from(data, offset)
+            offset += _SUBMIT.size
+            order_id = data[offset:offset + n].decode()
+            offset += n
+            yield kind, time, (order_id, _SIDES[side], None if price != price else price, qty)
+
+        elif kind == CANCEL:
+            (n,) = _CANCEL.unpack_from(data, offset)
+            offset += _CANCEL.size
+            yield kind, time, data[offset:offset + n].decode()
+            offset += n
+
+        elif kind == FAIR_VALUE:
+            (value,) = _FAIR_VALUE.unpack_from(data, offset)
+            offset += _FAIR_VALUE.size
+            yield kind, time, value
+
+        elif kind == AMEND:
+            qty, n = _AMEND.unpack_from(data, offset)
+            offset += _AMEND.size
+            yield kind, time, (data[offset:offset + n].decode(), qty)
+            offset += n
+
+        else:
+            raise ValueError(f"Corrupt journal record at byte {offset - _HEADER.size}")
+
+
+def replay_journal(path, order_book, on_fair_value=None):
+    """
+    Re-feed a journal straight into an order book, skipping agents.
+
+    Returns the number of records replayed.
+    """
+    submit = order_book.submit
+    cancel = order_book.cancel
+    amend = order_book.amend
+    count = 0
+
+    for kind, time, payload in read_journal(path):
+        if kind == SUBMIT:
+            order_id, side, price, qty = payload
+            submit(Order(order_id, side, price, qty, time))
+        elif kind == CANCEL:
+            cancel(payload)
+        elif kind == AMEND:
+            amend(payload[0], payload[1], time)
+        elif on_fair_value is not None:
+            on_fair_value(time, payload)
+        count += 1
+
+    return count
@@ -0,0 +1,194 @@
+import glob
+import os
+import queue
+import threading
+
+import numpy as np
+
+# Streaming storage for Logger output
+#
+# A ChunkedSink receives one table chunk at a time from a Logger and writes
+# it as its own file:
+#
+#     <directory>/<table>/part-00000.parquet
+#     <directory>/<table>/part-00001.parquet
+#     ...
+#
+# for the tables trades, l1, l2 and inventory. LogReader scans those files
+# lazily and offers the same *_df() methods as Logger, so analysis code can
+# take either. pyarrow is only needed once a sink or reader is created.
+
+TABLES = ("trades", "l1", "l2", "inventory")
+FORMATS = {"parquet": "parquet", "arrow": "arrow"}  # format -> file extension
+
+
+def schema(table, l2_depth=5):
+    """
+    Arrow schema of one table as written from a Logger.
+    """
+    pa = _pyarrow()
+    f64 = pa.float64()
+    if table == "trades":
+        fields = [("price", f64), ("qty", pa.int64()), ("buy", pa.string()), ("sell", pa.string())]
+    elif table == "l1":
+        fields = [("time", f64), ("best_bid", f64), ("best_ask", f64)]
+    elif table == "l2":
+        fields = [("time", f64)]
+        for side in ("bid", "ask"):
+            for i in range(l2_depth):
+                fields += [(f"{side}_price_{i}", f64), (f"{side}_qty_{i}", f64)]
+    elif table == "inventory":
+        fields = [("time", f64), ("agent", pa.string()), ("inventory", pa.int64())]
+    else:
+        raise ValueError(f"Unknown table: {table}")
+    return pa.schema(fields)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Streaming logs need pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+class ChunkedSink:
+    """
+    Writes Logger chunks to Parquet or Arrow IPC files.
+
+    With background=True chunks are handed to a writer thread through a
+    queue holding at most max_pending chunks, so a slow disk blocks the
+    simulation instead of letting memory grow. An existing log in the
+    directory is replaced.
+    """
+
+    def __init__(self, directory, chunk_size=100_000, format="parquet",
+                 background=False, max_pending=2):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown log format: {format}")
+
+        self.pa = _pyarrow()
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.format = format
+        self.background = background
+        self.parts = {table: 0 for table in TABLES}
+        self.rows = {table: 0 for table in TABLES}
+
+        ext = FORMATS[format]
+        for table in TABLES:
+            path = os.path.join(directory, table)
+            os.makedirs(path, exist_ok=True)
+            for old in glob.glob(os.path.join(path, f"part-*.{ext}")):
+                os.remove(old)
+
+        self._queue = None
+        self._error = None
+        if background:
+            self._queue = queue.Queue(maxsize=max_pending)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def write(self, table, columns):
+        """
+        Store one chunk; columns maps column name -> 1-D array.
+
+        In background mode the arrays must not be modified afterwards.
+        """
+        if self._error is not None:
+            raise self._error
+        if self._queue is not None:
+            self._queue.put((table, columns))
+        else:
+            self._write(table, columns)
+
+    def _write(self, table, columns):
+        pa = self.pa
+        data = pa.table(columns)
+        path = os.path.join(
+            self.directory, table, f"part-{self.parts[table]:05d}.{FORMATS[self.format]}"
+        )
+
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(data, path)
+        else:
+            with pa.ipc.new_file(path, data.schema) as writer:
+                writer.write_table(data)
+
+        self.parts[table] += 1
+        self.rows[table] += data.num_rows
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+            except Exception as exc:  # surfaced on the next write / close
+                self._error = exc
+
+    def close(self):
+        if self._queue is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._queue = None
+        if self._error is not None:
+            raise self._error
+
+
+class LogReader:
+    """
+    Lazy reader for a directory written by ChunkedSink.
+
+    scan() returns a pyarrow Dataset for filtered or column-pruned
+    reads, iter_batches() streams record batches, and the *_df()
+    methods mirror Logger's DataFrames. A table with no chunk files
+    reads as empty with its usual columns; l2_depth gives the L2 width
+    in that case.
+    """
+
+    def __init__(self, directory, format="parquet", l2_depth=5):
+        _pyarrow()
+        self.directory = directory
+        self.format = format
+        self.l2_depth = l2_depth
+
+    def scan(self, table):
+        import pyarrow.dataset as ds
+        path = os.path.join(self.directory, table)
+        files = sorted(glob.glob(os.path.join(path, f"part-*.{FORMATS[self.format]}")))
+        format = "parquet" if self.format == "parquet" else "ipc"
+        if not files:
+            return ds.dataset([], schema=schema(table, self.l2_depth), format=format)
+        return ds.dataset(files, format=format)
+
+    def iter_batches(self, table, columns=None, batch_size=65_536):
+        for batch in self.scan(table).to_batches(columns=columns, batch_size=batch_size):
+            yield batch
+
+    def _df(self, table, columns=None):
+        return self.scan(table).to_table(columns=columns).to_pandas()
+
+    def trades_df(self):
+        return self._df("trades")
+
+    def l1_df(self):
+        df = self._df("l1")
+        df["spread"] = df["best_ask"] - df["best_bid"]
+        df["mid"] = (df["best_ask"] + df["best_bid"]) / 2
+        return df
+
+    def inventory_df(self):
+        return self._df("inventory")
+
+    def l2_arrays(self):
+        # (times, bids, asks) with bids / asks shaped (n, depth, 2)
+        df = self._df("l2")
+        depth = sum(1 for name in df.columns if name.startswith("bid_price_"))
+        sides = []
+        for side in ("bid", "ask"):
+            cols = [f"{side}_{field}_{i}" for i in range(depth) for field in ("price", "qty")]
+            sides.append(df[cols].to_numpy(dtype=np.float64).reshape(-1, depth, 2))
+        return df["time"].to_numpy(), sides[0], sides[1]
@@ -1,50 +1,300 @@
-import pandas as pd
+import numpy as np
+
+# pandas is only imported when a DataFrame is requested
+
+
+class GrowableArray:
+    """
+    Append-only typed column with amortized O(1) appends.
+
+    view() returns the filled part of the buffer without copying.
+    """
+
+    def __init__(self, dtype, shape=(), capacity=1024):
+        self.data = np.empty((capacity,) + tuple(shape), dtype=dtype)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, n):
+        needed = self.size + n
+        if needed > len(self.data):
+            capacity = max(2 * len(self.data), needed)
+            data = np.empty((capacity,) + self.data.shape[1:], dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self._reserve(1)
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        n = len(values)
+        self._reserve(n)
+        self.data[self.size:self.size + n] = values
+        self.size += n
+
+    def view(self):
+        return self.data[:self.size]
+
+    def clear(self):
+        self.size = 0
+
 
 class Logger:
-    def __init__(self):
-        self.trades = []
-        self.l1 = []
-        self.l2 = []
-        self.inventory = []
+    """
+    Columnar market logger.
+
+    Every field is a typed GrowableArray and the *_df() methods wrap
+    the numeric and id columns without copying, so the DataFrames share
+    memory with the logger: take a .copy() before clear() if they must
+    survive it. The one exception is inventory_df()'s agent column, a
+    categorical whose small integer codes are copied from the buffer.
+
+    The record-style trades / l1 / l2 / inventory lists of the old
+    logger are still available as read-only properties, built on demand.
+
+    L2 samples are stored as fixed-depth (n, l2_depth, 2) arrays of
+    (price, qty), NaN where a level is missing.
+
+    With a sink (log_sink.ChunkedSink) each table is handed to the sink
+    and emptied every sink.chunk_size records, so memory stays bounded
+    and the *_df() methods only see the records not yet flushed. Call
+    close() at the end of a run to write the rest.
+    """
+
+    # table -> buffers holding it, flushed together
+    _TABLE_COLUMNS = {
+        "trades": ("trade_price", "trade_qty", "trade_buy", "trade_sell"),
+        "l1": ("l1_time", "l1_bid", "l1_ask"),
+        "l2": ("l2_time", "l2_bids", "l2_asks"),
+        "inventory": ("inv_time", "inv_agent", "inv_qty"),
+    }
+
+    def __init__(self, l2_depth=5, sink=None):
+        self.l2_depth = l2_depth
+        self.sink = sink
+        self._chunk = sink.chunk_size if sink is not None else None
+
+        self.trade_price = GrowableArray(np.float64)
+        self.trade_qty = GrowableArray(np.int64)
+        self.trade_buy = GrowableArray(object)
+        self.trade_sell = GrowableArray(object)
+
+        self.l1_time = GrowableArray(np.float64)
+        self.l1_bid = GrowableArray(np.float64)
+        self.l1_ask = GrowableArray(np.float64)
+
+        self.l2_time = GrowableArray(np.float64)
+        self.l2_bids = GrowableArray(np.float64, (l2_depth, 2))
+        self.l2_asks = GrowableArray(np.float64, (l2_depth, 2))
+
+        # Long format: one entry per agent per snapshot
+        self.inv_time = GrowableArray(np.float64)
+        self.inv_agent = GrowableArray(np.int32)  # index into agent_names
+        self.inv_qty = GrowableArray(np.int64)
+        self.agent_names = []
+        self._agent_index = {}  # agent id -> index into agent_names
+
+    def _columns(self):
+        return [value for value in vars(self).values() if isinstance(value, GrowableArray)]
+
+    def clear(self):
+        for column in self._columns():
+            column.clear()
+        self.agent_names.clear()
+        self._agent_index.clear()
+
+    # ------------------------------------------------------------------
+    # streaming
+    # ------------------------------------------------------------------
+
+    def _table_columns(self, table):
+        # Flat columns for one table, as views of the buffers
+        if table == "trades":
+            return {
+                "price": self.trade_price.view(),
+                "qty": self.trade_qty.view(),
+                "buy": self.trade_buy.view(),
+                "sell": self.trade_sell.view(),
+            }
+        if table == "l1":
+            return {
+                "time": self.l1_time.view(),
+                "best_bid": self.l1_bid.view(),
+                "best_ask": self.l1_ask.view(),
+            }
+        if table == "l2":
+            columns = {"time": self.l2_time.view()}
+            for side, levels in (("bid", self.l2_bids.view()), ("ask", self.l2_asks.view())):
+                for i in range(self.l2_depth):
+                    columns[f"{side}_price_{i}"] = levels[:, i, 0]
+                    columns[f"{side}_qty_{i}"] = levels[:, i, 1]
+            return columns
+        if table == "inventory":
+            names = np.array(self.agent_names, dtype=object)
+            return {
+                "time": self.inv_time.view(),
+                "agent": names[self.inv_agent.view()],
+                "inventory": self.inv_qty.view(),
+            }
+        raise ValueError(f"Unknown table: {table}")
+
+    def flush(self, table=None):
+        """
+        Hand buffered records to the sink and empty the buffers.
+        """
+        tables = self._TABLE_COLUMNS if table is None else (table,)
+        for name in tables:
+            first = getattr(self, self._TABLE_COLUMNS[name][0])
+            if len(first) == 0:
+                continue
+            columns = self._table_columns(name)
+            if self.sink.background:
+                # The writer thread reads these after the buffers are reused
+                columns = {key: np.array(value) for key, value in columns.items()}
+            self.sink.write(name, columns)
+            for attr in self._TABLE_COLUMNS[name]:
+                getattr(self, attr).clear()
+
+    def close(self):
+        if self.sink is not None:
+            self.flush()
+            self.sink.close()
+
+    # ------------------------------------------------------------------
+    # recording
+    # ------------------------------------------------------------------
 
     def record_trade(self, trade):
-        self.trades.append({
-            "price": trade.price,
-            "qty": trade.qty,
-            "buy": trade.buy_order_id,
-            "sell": trade.sell_order_id
-        })
+        self.trade_price.append(trade.price)
+        self.trade_qty.append(trade.qty)
+        self.trade_buy.append(trade.buy_order_id)
+        self.trade_sell.append(trade.sell_order_id)
+        if self._chunk is not None and self.trade_price.size >= self._chunk:
+            self.flush("trades")
+
+    def on_fill(self, trade, maker, taker):
+        self.record_trade(trade)
+
+    @property
+    def trades(self):
+        # Record-style view of the trade columns, built on demand
+        return [
+            {"price": p, "qty": q, "buy": b, "sell": s}
+            for p, q, b, s in zip(
+                self.trade_price.view().tolist(), self.trade_qty.view().tolist(),
+                self.trade_buy.view(), self.trade_sell.view(),
+            )
+        ]
+
+    @property
+    def l1(self):
+        return [
+            {"time": t, "best_bid": b, "best_ask": a, "spread": a - b, "mid": (a + b) / 2}
+            for t, b, a in zip(
+                self.l1_time.view().tolist(), self.l1_bid.view().tolist(), self.l1_ask.view().tolist(),
+            )
+        ]
+
+    @property
+    def l2(self):
+        # Levels as (price, qty) tuples, missing levels dropped
+        def levels(rows):
+            return [(p, int(q)) for p, q in rows.tolist() if p == p]
+
+        return [
+            {"time": t, "bids": levels(b), "asks": levels(a)}
+            for t, b, a in zip(self.l2_time.view().tolist(), self.l2_bids.view(), self.l2_asks.view())
+        ]
+
+    @property
+    def inventory(self):
+        return [
+            {"time": t, "agent": self.agent_names[i], "inventory": q}
+            for t, i, q in zip(
+                self.inv_time.view().tolist(), self.inv_agent.view().tolist(), self.inv_qty.view().tolist(),
+            )
+        ]
 
     def record_l1(self, time, bid, ask):
         if bid is None or ask is None:
             return
-        self.l1.append({
-            "time": time,
-            "best_bid": bid,
-            "best_ask": ask,
-            "spread": ask - bid,
-            "mid": (ask + bid) / 2
-        })
+        self.l1_time.append(time)
+        self.l1_bid.append(bid)
+        self.l1_ask.append(ask)
+        if self._chunk is not None and self.l1_time.size >= self._chunk:
+            self.flush("l1")
+
+    def _write_levels(self, column, levels):
+        column.append(np.nan)
+        n = min(len(levels), self.l2_depth)
+        if n:
+            column.data[column.size - 1, :n] = levels[:n]
 
     def record_l2(self, time, bids, asks):
-        self.l2.append({
-            "time": time,
-            "bids": bids,
-            "asks": asks
-        })
+        self.l2_time.append(time)
+        self._write_levels(self.l2_bids, bids)
+        self._write_levels(self.l2_asks, asks)
+        if self._chunk is not None and self.l2_time.size >= self._chunk:
+            self.flush("l2")
+
+    def l2_arrays(self):
+        # (times, bids, asks) with bids / asks shaped (n, l2_depth, 2)
+        return self.l2_time.view(), self.l2_bids.view(), self.l2_asks.view()
 
     def trades_df(self):
-        return pd.DataFrame(self.trades)
+        import pandas as pd
+        return pd.DataFrame({
+            "price": self.trade_price.view(),
+            "qty": self.trade_qty.view(),
+            "buy": self.trade_buy.view(),
+            "sell": self.trade_sell.view(),
+        }, copy=False)
 
     def l1_df(self):
-        return pd.DataFrame(self.l1)
-    
+        import pandas as pd
+        bid, ask = self.l1_bid.view(), self.l1_ask.view()
+        return pd.DataFrame({
+            "time": self.l1_time.view(),
+            "best_bid": bid,
+            "best_ask": ask,
+            "spread": ask - bid,
+            "mid": (ask + bid) / 2,
+        }, copy=False)
+
+    def _agent_slot(self, agent_id):
+        slot = self._agent_index.get(agent_id)
+        if slot is None:
+            slot = self._agent_index[agent_id] = len(self.agent_names)
+            self.agent_names.append(agent_id)
+        return slot
+
     def record_inventory(self, time, agent_id, inventory):
-        self.inventory.append({
-            "time": time,
-            "agent": agent_id,
-            "inventory": inventory
-        })
+        # One agent's position, or with a list of ids the positions of
+        # several agents aligned with them
+        if isinstance(agent_id, str):
+            self.inv_time.append(time)
+            self.inv_agent.append(self._agent_slot(agent_id))
+            self.inv_qty.append(inventory)
+        else:
+            n = len(agent_id)
+            self.inv_time.extend(np.full(n, time))
+            self.inv_agent.extend(np.fromiter(map(self._agent_slot, agent_id), np.int32, n))
+            self.inv_qty.extend(inventory)
+        if self._chunk is not None and self.inv_time.size >= self._chunk:
+            self.flush("inventory")
 
     def inventory_df(self):
-        return pd.DataFrame(self.inventory)
+        import pandas as pd
+        # time / inventory are views; the agent codes are copied into
+        # the categorical's own (smallest fitting) integer dtype
+        agent = pd.Categorical.from_codes(self.inv_agent.view(), categories=self.agent_names)
+        return pd.DataFrame({
+            "time": self.inv_time.view(),
+            "agent": agent,
+            "inventory": self.inv_qty.view(),
+        }, copy=False)
@@ -1,3 +1,4 @@
+import os
 import random
 import numpy as np
 import pandas as pd
@@ -11,6 +12,7 @@ from order_book import OrderBook
 from engine import MarketEngine
 from environment import MarketEnvironment
 from logger import Logger
+from log_sink import ChunkedSink, LogReader
 from market_config import MarketConfig
 from events import (
     AgentArrivalEvent,
@@ -22,19 +24,21 @@ from events import (
 
 # Core simulation runner
 
-def run_scenario(agents, seed=42, horizon=500):
+def run_scenario(agents, seed=42, horizon=500, log_dir=None):
+    # With log_dir the logs are streamed to chunked Parquet files and a
+    # LogReader over them is returned instead of the in-memory logger
     random.seed(seed)
     np.random.seed(seed)
 
     book = OrderBook()
-    logger = Logger()
+    logger = Logger(sink=ChunkedSink(log_dir) if log_dir is not None else None)
     engine = MarketEngine(book, logger)
     env = MarketEnvironment(engine, MarketConfig(snapshot_interval=1.0))
 
     fair_value = FairValueProcess(initial_value=100.0, sigma=0.5, seed=seed)
 
     for agent in agents:
-        engine.agents[agent.agent_id] = agent
+        engine.add_agent(agent)
         t0 = agent.next_event_time(0)
         engine.schedule(AgentArrivalEvent(t0, agent, env))
 
@@ -43,6 +47,10 @@ def run_scenario(agents, seed=42, horizon=500):
     engine.schedule(MarketCloseEvent(horizon))
 
     engine.run()
+
+    if log_dir is not None:
+        logger.close()
+        return LogReader(log_dir)
     return logger
 
 
@@ -123,6 +131,7 @@ def scenario_noise_momentum(seed):
 def main():
     SEED = 42
     HORIZON = 500
+    LOG_DIR = None  # e.g. "logs/market_report" to stream logs to disk
 
     print("\nRunning Day-10 ecosystem experiments...\n")
 
@@ -134,8 +143,9 @@ def main():
 
     results = {}
 
-    for name, agents in scenarios.items():
-        logger = run_scenario(agents, seed=SEED, horizon=HORIZON)
+    for i, (name, agents) in enumerate(scenarios.items()):
+        log_dir = os.path.join(LOG_DIR, f"scenario_{i}") if LOG_DIR is not None else None
+        logger = run_scenario(agents, seed=SEED, horizon=HORIZON, log_dir=log_dir)
         results[name] = extract_metrics(logger)
 
     all_prices = pd.concat([m["mid"] for m in results.values()])
@@ -15,23 +15,112 @@ def sharpe_ratio(returns, risk_free_rate=0.0):
     return np.mean(excess) / std
 
 def max_drawdown(portfolio_values):
-    values = np.array(portfolio_values)
-    peak = values[0]
-    max_dd = 0.0
-    for v in values:
-        peak = max(peak, v)
-        dd = (peak - v) / peak
-        max_dd = max(max_dd, dd)
-    return max_dd
+    values = np.asarray(portfolio_values, dtype=float)
+    peak = np.maximum.accumulate(values)
+    return float(np.max((peak - values) / peak))
 
-def aggregate_metrics(runs):
-    sharpes = []
-    drawdowns = []
 
-    for pv in runs:
-        rets = compute_returns(pv)
-        sharpes.append(sharpe_ratio(rets))
-        drawdowns.append(max_drawdown(pv))
+# =====================
+# BATCHED METRICS
+# =====================
+#
+# Runs are stacked into a (runs, timesteps) array. Ragged runs are padded
+# by repeating their last value and a boolean mask marks the real steps,
+# so every metric below is a handful of array passes over all runs.
+
+def pad_runs(runs):
+    """
+    Stack ragged runs into (values, mask) arrays of shape (runs, timesteps).
+    """
+    lengths = np.array([len(r) for r in runs], dtype=np.int64)
+    n_steps = int(lengths.max()) if len(runs) else 0
+
+    values = np.ones((len(runs), n_steps))
+    for i, run in enumerate(runs):
+        if len(run):
+            values[i, :len(run)] = run
+            values[i, len(run):] = run[-1]
+
+    mask = np.arange(n_steps) < lengths[:, None]
+    return values, mask
+
+def batch_returns(values, mask):
+    # Simple returns and the mask of steps where both ends are real
+    returns = np.diff(values, axis=1) / values[:, :-1]
+    return returns, mask[:, 1:]
+
+def _masked_mean(x, mask, n):
+    return np.where(mask, x, 0.0).sum(axis=1) / np.maximum(n, 1)
+
+def batch_sharpe(returns, mask, risk_free_rate=0.0):
+    n = mask.sum(axis=1)
+    excess = returns - risk_free_rate
+    mean = _masked_mean(excess, mask, n)
+    std = np.sqrt(_masked_mean((excess - mean[:, None]) ** 2, mask, n))
+
+    out = np.zeros(len(n))
+    ok = (n > 0) & (std > 0)
+    out[ok] = mean[ok] / std[ok]
+    return out
+
+def batch_sortino(returns, mask, risk_free_rate=0.0):
+    n = mask.sum(axis=1)
+    excess = returns - risk_free_rate
+    mean = _masked_mean(excess, mask, n)
+    downside = np.sqrt(_masked_mean(np.minimum(excess, 0.0) ** 2, mask, n))
+
+    out = np.zeros(len(n))
+    ok = (n > 0) & (downside > 0)
+    out[ok] = mean[ok] / downside[ok]
+    return out
+
+def drawdown_curves(values, mask=None):
+    # Relative drawdown from the running peak; 0 on padded steps
+    peak = np.maximum.accumulate(values, axis=1)
+    dd = (peak - values) / peak
+    if mask is not None:
+        dd[~mask] = 0.0
+    return dd
+
+def batch_max_drawdown(values, mask=None):
+    if values.shape[1] == 0:
+        return np.zeros(len(values))
+    return drawdown_curves(values, mask).max(axis=1)
+
+def batch_calmar(values, mask):
+    # Episode return over max drawdown (no annualization)
+    lengths = mask.sum(axis=1)
+    rows = np.arange(len(values))
+    total_return = np.zeros(len(values))
+    ok = lengths > 0
+    total_return[ok] = values[rows[ok], lengths[ok] - 1] / values[ok, 0] - 1
+
+    mdd = batch_max_drawdown(values, mask)
+    out = np.zeros(len(values))
+    ok &= mdd > 0
+    out[ok] = total_return[ok] / mdd[ok]
+    return out
+
+def batch_metrics(runs, risk_free_rate=0.0):
+    """
+    Per-run Sharpe, Sortino, max drawdown, Calmar and drawdown curves.
+    """
+    values, mask = pad_runs(runs)
+    returns, rmask = batch_returns(values, mask)
+
+    return {
+        "sharpe": batch_sharpe(returns, rmask, risk_free_rate),
+        "sortino": batch_sortino(returns, rmask, risk_free_rate),
+        "max_drawdown": batch_max_drawdown(values, mask),
+        "calmar": batch_calmar(values, mask),
+        "drawdown_curves": drawdown_curves(values, mask),
+        "mask": mask,
+    }
+
+def aggregate_metrics(runs):
+    metrics = batch_metrics(runs)
+    sharpes = metrics["sharpe"]
+    drawdowns = metrics["max_drawdown"]
 
     return {
         "mean_sharpe": float(np.mean(sharpes)),
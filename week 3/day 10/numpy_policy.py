@@ -0,0 +1,92 @@
+import numpy as np
+
+# Torch-free inference for trained PPO MlpPolicy networks.
+#
+# export_policy() pulls the actor weights out of an SB3 PPO model into a
+# small .npz file; NumpyPolicy replays the same forward pass in NumPy and
+# mimics PPO.predict() so it can be dropped in wherever a model is used.
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0.0),
+}
+
+
+def export_policy(model, path):
+    """
+    Save the actor network of a PPO MlpPolicy (model or saved path) as .npz.
+    """
+    import torch.nn as nn
+    from stable_baselines3 import PPO
+
+    if isinstance(model, str):
+        model = PPO.load(model)
+
+    policy = model.policy
+    layers = [m for m in policy.mlp_extractor.policy_net if isinstance(m, nn.Linear)]
+    layers.append(policy.action_net)
+
+    arrays = {}
+    for i, layer in enumerate(layers):
+        arrays[f"W{i}"] = layer.weight.detach().cpu().numpy().astype(np.float32)
+        arrays[f"b{i}"] = layer.bias.detach().cpu().numpy().astype(np.float32)
+
+    np.savez(
+        path,
+        n_layers=len(layers),
+        activation=policy.activation_fn.__name__.lower(),
+        **arrays,
+    )
+
+
+class NumpyPolicy:
+    def __init__(self, weights, biases, activation="tanh", seed=None):
+        self.weights = [np.ascontiguousarray(w.T) for w in weights]  # (in, out)
+        self.biases = list(biases)
+        self.activation = ACTIVATIONS[activation]
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        n = int(data["n_layers"])
+        return cls(
+            [data[f"W{i}"] for i in range(n)],
+            [data[f"b{i}"] for i in range(n)],
+            activation=str(data["activation"]),
+        )
+
+    def logits(self, obs):
+        x = np.asarray(obs, dtype=np.float32)
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = self.activation(x @ w + b)
+        return x @ self.weights[-1] + self.biases[-1]
+
+    def predict(self, obs, deterministic=True):
+        obs = np.asarray(obs, dtype=np.float32)
+        single = obs.ndim == 1
+        logits = self.logits(obs.reshape(1, -1) if single else obs)
+
+        if deterministic:
+            actions = logits.argmax(axis=1)
+        else:
+            z = np.exp(logits - logits.max(axis=1, keepdims=True))
+            cdf = np.cumsum(z / z.sum(axis=1, keepdims=True), axis=1)
+            u = self.rng.random((len(cdf), 1))
+            actions = np.minimum((cdf < u).sum(axis=1), cdf.shape[1] - 1)
+
+        return (actions[0] if single else actions), None
+
+
+def load_policy(model_path):
+    # .npz exports run without torch; anything else goes through SB3
+    if str(model_path).endswith(".npz"):
+        return NumpyPolicy.load(model_path)
+
+    from stable_baselines3 import PPO
+    return PPO.load(model_path)
+
+
+if __name__ == "__main__":
+    export_policy("ppo_trading_agent", "ppo_trading_agent.npz")
+    print(" Saved ppo_trading_agent.npz")
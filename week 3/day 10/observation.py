@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class ObservationEncoder:
+    """
+    Shared observation layout for TradingEnv (training) and PPOAgent
+    (deployment).
+
+    Layout, each block `depth` wide unless noted:
+        bid distance from mid / mid, bid size / max_cash,
+        ask distance from mid / mid, ask size / max_cash,
+        normalized inventory (1), cash / max_cash (1)
+
+    Missing levels are encoded as 0 and the vector is clipped to [0, 1].
+    Features are written into a preallocated float32 buffer, or into
+    `out` (e.g. a slice of a larger observation) when given.
+    """
+
+    def __init__(self, depth=5, max_inventory=20, max_cash=100_000):
+        self.depth = depth
+        self.max_inventory = max_inventory
+        self.max_cash = max_cash
+        self.size = 4 * depth + 2
+        self.buffer = np.zeros(self.size, dtype=np.float32)
+
+    def encode(self, snapshot, mid, inventory, cash, out=None):
+        if out is None:
+            out = self.buffer
+
+        d = self.depth
+        out[:] = 0.0
+        # Levels are written straight from the snapshot's (price, qty)
+        # lists; at most `depth` per side, no intermediate arrays
+        for i, (price, qty) in zip(range(d), snapshot.bids):
+            out[i] = (mid - price) / mid
+            out[d + i] = qty / self.max_cash
+        for i, (price, qty) in zip(range(d), snapshot.asks):
+            out[2 * d + i] = (price - mid) / mid
+            out[3 * d + i] = qty / self.max_cash
+        out[4 * d] = (inventory + self.max_inventory) / (2 * self.max_inventory)
+        out[4 * d + 1] = cash / self.max_cash
+
+        np.clip(out, 0.0, 1.0, out=out)
+        return out
@@ -7,3 +7,4 @@ class Order:
     price: float | None
     qty: int
     timestamp: int
+    owner: int | None = None  # integer id of the submitting agent
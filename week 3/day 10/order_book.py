@@ -2,14 +2,39 @@ import heapq
 from trade import Trade
 from snapshot import BookSnapshot
 
+# Book update kinds subscribers can register for
+FILL = "fill"      # callback(trade, maker, taker)
+ADD = "add"        # callback(order)  - order now resting in the book
+CANCEL = "cancel"  # callback(order)  - resting order removed
+AMEND = "amend"    # callback(order, old_qty) - resting order resized
+
 class OrderBook:
     def __init__(self):
         self.bids = [] # list of (-price, timestamp, order)
         self.asks = [] # list of ( price, timestamp, order)
         self.trades = []
         self.snapshots = {}
+        self.version = 0  # bumped on every book mutation
+        self.orders = {}  # order_id -> resting order
+        self.subscribers = {FILL: [], ADD: [], CANCEL: [], AMEND: []}
+
+    def clear(self):
+        # Empty the book in place; subscribers stay registered
+        self.version += 1
+        self.bids.clear()
+        self.asks.clear()
+        self.trades.clear()
+        self.snapshots.clear()
+        self.orders.clear()
+
+    def subscribe(self, kind, callback):
+        self.subscribers[kind].append(callback)
+
+    def unsubscribe(self, kind, callback):
+        self.subscribers[kind].remove(callback)
 
     def submit(self, order):
+        self.version += 1
         self._match(order)
         if order.price is not None and order.qty > 0:
             self._add(order)
@@ -20,9 +45,13 @@ class OrderBook:
             heapq.heappush(self.bids, (-order.price, order.timestamp, order))
         else:
             heapq.heappush(self.asks, (order.price, order.timestamp, order))
+        self.orders[order.order_id] = order
+        for callback in self.subscribers[ADD]:
+            callback(order)
 
     def _match(self, incoming):
         opposite = self.asks if incoming.side == "BUY" else self.bids
+        on_fill = self.subscribers[FILL]
         while incoming.qty > 0 and opposite:
             price, _, top = opposite[0]
             best_price = price if incoming.side == "BUY" else -price
@@ -35,23 +64,30 @@ class OrderBook:
             traded = min(incoming.qty, top.qty)
             incoming.qty -= traded
             top.qty -= traded
-            self.trades.append(
-                Trade(
-                    price=best_price,
-                    qty=traded,
-                    buy_order_id=incoming.order_id if incoming.side == "BUY" else top.order_id,
-                    sell_order_id=incoming.order_id if incoming.side == "SELL" else top.order_id,
-                )
+            trade = Trade(
+                price=best_price,
+                qty=traded,
+                buy_order_id=incoming.order_id if incoming.side == "BUY" else top.order_id,
+                sell_order_id=incoming.order_id if incoming.side == "SELL" else top.order_id,
             )
+            self.trades.append(trade)
+            for callback in on_fill:
+                callback(trade, top, incoming)
             if top.qty > 0:
                 heapq.heappush(opposite, (price, top.timestamp, top))
+            elif self.orders.get(top.order_id) is top:
+                del self.orders[top.order_id]
 
     def cancel_random(self, prob):
         import random
+        self.version += 1
         for book in (self.bids, self.asks):
             if book and random.random() < prob:
-                book.pop(random.randrange(len(book)))
+                _, _, order = book.pop(random.randrange(len(book)))
                 heapq.heapify(book)
+                self.orders.pop(order.order_id, None)
+                for callback in self.subscribers[CANCEL]:
+                    callback(order)
 
     def _snapshot(self, order_id):
         self.snapshots[order_id] = BookSnapshot(self.bids, self.asks)
@@ -61,8 +97,87 @@ class OrderBook:
 
     def book_after(self, order_id):
         return self.snapshots[order_id]
-    
+
+    def _remove(self, order):
+        book = self.bids if order.side == "BUY" else self.asks
+        book[:] = [x for x in book if x[2] is not order]
+        heapq.heapify(book)
+
     def cancel(self, order_id):
-        for book in (self.bids, self.asks):
-            book[:] = [x for x in book if x[2].order_id != order_id]
-            heapq.heapify(book)
+        # Returns False if the order is not resting in the book
+        self.version += 1
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+
+        self._remove(order)
+        for callback in self.subscribers[CANCEL]:
+            callback(order)
+        return True
+
+    def replace_orders(self, cancel_ids, orders):
+        """
+        Bulk quote update: remove the resting orders in cancel_ids and
+        submit the new orders as one book mutation, rebuilding each
+        side's heap at most once.
+        """
+        self.version += 1
+
+        removed = []
+        for order_id in cancel_ids:
+            order = self.orders.pop(order_id, None)
+            if order is not None:
+                removed.append(order)
+
+        if removed:
+            gone = set(map(id, removed))
+            for book in (self.bids, self.asks):
+                book[:] = [x for x in book if id(x[2]) not in gone]
+                heapq.heapify(book)
+            for order in removed:
+                for callback in self.subscribers[CANCEL]:
+                    callback(order)
+
+        for order in orders:
+            self._match(order)
+            if order.price is not None and order.qty > 0:
+                self._add(order)
+
+        snapshot = BookSnapshot(self.bids, self.asks)
+        for order in orders:
+            self.snapshots[order.order_id] = snapshot
+
+    def amend(self, order_id, qty, timestamp=None):
+        """
+        Change the size of a resting order in place.
+
+        Size decreases keep queue priority; increases go to the back of
+        the queue at `timestamp`. A size of zero cancels the order.
+        Returns False if the order is not resting in the book.
+        """
+        order = self.orders.get(order_id)
+        if order is None:
+            return False
+
+        if qty <= 0:
+            self.cancel(order_id)
+            return True
+
+        self.version += 1
+        old_qty = order.qty
+
+        if qty > old_qty:
+            self._remove(order)
+            order.qty = qty
+            if timestamp is not None:
+                order.timestamp = timestamp
+            if order.side == "BUY":
+                heapq.heappush(self.bids, (-order.price, order.timestamp, order))
+            else:
+                heapq.heappush(self.asks, (order.price, order.timestamp, order))
+        else:
+            order.qty = qty
+
+        for callback in self.subscribers[AMEND]:
+            callback(order, old_qty)
+        return True
@@ -0,0 +1,60 @@
+from actions import PlaceLimit, Cancel, Amend
+
+SIDES = ("BUY", "SELL")
+
+
+class QuoteManager:
+    """
+    Keeps one live quote per side for an agent and turns the quotes it
+    wants into the minimal set of actions.
+
+    Unchanged quotes produce no messages, size-only changes become an
+    Amend (keeping queue priority on decreases) and only price changes
+    cancel and re-place. Prices are compared on the environment's tick
+    grid, passed in with every update.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.live = {side: None for side in SIDES}  # side -> PlaceLimit
+        self.messages = 0
+
+    def update(self, desired, tick_size):
+        """
+        desired maps "BUY"/"SELL" to (price, qty), or None for no quote;
+        tick_size is market_state["tick_size"].
+        """
+        actions = []
+        active = self.agent.active_orders
+
+        for side in SIDES:
+            target = desired.get(side)
+            live = self.live[side]
+
+            # Quote was filled or cancelled since the last update
+            if live is not None and live.order_id not in active:
+                live = None
+
+            if target is None:
+                if live is not None:
+                    actions.append(Cancel(live.order_id))
+                self.live[side] = None
+                continue
+
+            # Same tick rounding the environment applies to limit orders
+            price, qty = round(target[0] / tick_size) * tick_size, target[1]
+
+            if live is not None and live.price == price:
+                if active[live.order_id] != qty:
+                    actions.append(Amend(live.order_id, qty))
+                continue
+
+            if live is not None:
+                actions.append(Cancel(live.order_id))
+
+            quote = PlaceLimit(side, price, qty)
+            actions.append(quote)
+            self.live[side] = quote
+
+        self.messages += len(actions)
+        return actions
@@ -0,0 +1,90 @@
+import multiprocessing as mp
+import os
+
+import optuna
+from optuna.storages import JournalStorage
+from optuna.storages.journal import JournalFileBackend
+
+from Optuna_study import SEED, objective
+
+# =====================
+# GLOBAL CONFIG
+# =====================
+
+N_WORKERS = os.cpu_count() or 1
+N_TRIALS = 20                      # total across all workers
+STUDY_NAME = "ppo_trading_day9_parallel"
+JOURNAL_PATH = "day9_optuna.journal"
+
+# =====================
+# STORAGE
+# =====================
+
+def make_storage(path=JOURNAL_PATH):
+    # Append-only journal file with file locking, safe for several
+    # processes writing the same study
+    return JournalStorage(JournalFileBackend(path))
+
+
+def make_pruner():
+    # Same pruner as the serial study in Optuna_study.py
+    return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+
+
+# =====================
+# WORKER
+# =====================
+
+def run_worker(worker_id, n_trials, journal_path=JOURNAL_PATH):
+    # Workers get different sampler seeds so they do not propose the
+    # same parameters in lockstep
+    study = optuna.load_study(
+        study_name=STUDY_NAME,
+        storage=make_storage(journal_path),
+        sampler=optuna.samplers.TPESampler(seed=SEED + worker_id),
+        pruner=make_pruner(),
+    )
+    study.optimize(objective, n_trials=n_trials)
+
+
+# =====================
+# STUDY RUNNER
+# =====================
+
+def main(n_workers=N_WORKERS, n_trials=N_TRIALS, journal_path=JOURNAL_PATH):
+    storage = make_storage(journal_path)
+    study = optuna.create_study(
+        direction="maximize",
+        study_name=STUDY_NAME,
+        storage=storage,
+        load_if_exists=True,
+    )
+
+    # Split the trial budget across workers
+    n_workers = max(1, min(n_workers, n_trials))
+    counts = [n_trials // n_workers + (i < n_trials % n_workers) for i in range(n_workers)]
+
+    # torch does not survive fork well; start clean interpreters
+    ctx = mp.get_context("spawn")
+    workers = [
+        ctx.Process(target=run_worker, args=(i, counts[i], journal_path))
+        for i in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    states = [t.state for t in study.get_trials(deepcopy=False)]
+    print(f"\nFinished: {states.count(optuna.trial.TrialState.COMPLETE)} complete, "
+          f"{states.count(optuna.trial.TrialState.PRUNED)} pruned")
+
+    print("\n=== BEST TRIAL ===")
+    print("Value:", study.best_trial.value)
+    print("Params:")
+    for k, v in study.best_trial.params.items():
+        print(f"  {k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
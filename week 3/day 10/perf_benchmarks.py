@@ -0,0 +1,336 @@
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from agents import NoiseTraderAgent, NoiseTraderPopulation, MarketMakerAgent
+from fair_value import FairValueProcess
+from order import Order
+from order_book import OrderBook
+from engine import MarketEngine
+from environment import MarketEnvironment
+from logger import Logger
+from market_config import MarketConfig
+from trade import Trade
+from events import (
+    AgentArrivalEvent,
+    MarketCloseEvent,
+    SnapshotEvent,
+    FairValueUpdateEvent,
+)
+
+# =====================
+# GLOBAL CONFIG
+# =====================
+
+SEED = 42
+RESULTS_DIR = "results"
+OUTPUT_PATH = os.path.join(RESULTS_DIR, "perf_benchmarks.json")
+
+BOOK_SIZES = [100, 1_000, 10_000]
+BOOK_OPS = 2_000
+AGENT_COUNTS = [10, 100, 1_000, 10_000]
+ENGINE_EVENTS = 20_000   # target events per engine run
+CROWD_SIZES = [100, 1_000, 10_000]
+ENV_STEPS = 5_000
+LOGGER_RECORDS = 100_000
+
+
+def _timed(fn, n):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return {"ops": n, "seconds": elapsed, "ops_per_sec": n / elapsed if elapsed > 0 else None}
+
+
+# =====================
+# ORDER BOOK
+# =====================
+
+def _filled_book(size, rng):
+    # Resting, non-crossing liquidity on both sides of 100
+    book = OrderBook()
+    for i in range(size):
+        side = "BUY" if i % 2 == 0 else "SELL"
+        offset = int(rng.integers(1, 50))
+        price = 100 - offset if side == "BUY" else 100 + offset
+        book.submit(Order(f"B{i}", side, price, int(rng.integers(1, 10)), i))
+    return book
+
+
+def bench_order_book(sizes=BOOK_SIZES, n_ops=BOOK_OPS, seed=SEED):
+    results = []
+
+    for size in sizes:
+        rng = np.random.default_rng(seed)
+
+        book = _filled_book(size, rng)
+        orders = [
+            Order(f"S{i}", "BUY" if i % 2 == 0 else "SELL",
+                  100 - 60 if i % 2 == 0 else 100 + 60, 1, size + i)
+            for i in range(n_ops)
+        ]
+
+        def submit():
+            for order in orders:
+                book.submit(order)
+
+        submit_stats = _timed(submit, n_ops)
+
+        def cancel():
+            for i in range(n_ops):
+                book.cancel(f"S{i}")
+
+        cancel_stats = _timed(cancel, n_ops)
+
+        def snapshot():
+            for _ in range(n_ops):
+                book.current_snapshot()
+
+        snapshot_stats = _timed(snapshot, n_ops)
+
+        results.append({
+            "book_size": size,
+            "submit": submit_stats,
+            "cancel": cancel_stats,
+            "current_snapshot": snapshot_stats,
+        })
+
+    return results
+
+
+# =====================
+# ENGINE
+# =====================
+
+def bench_engine(agent_counts=AGENT_COUNTS, target_events=ENGINE_EVENTS, seed=SEED):
+    results = []
+
+    for n_agents in agent_counts:
+        random.seed(seed)
+        np.random.seed(seed)
+
+        book = OrderBook()
+        logger = Logger()
+        engine = MarketEngine(book, logger)
+        env = MarketEnvironment(engine, MarketConfig(snapshot_interval=1.0))
+        fv = FairValueProcess(initial_value=100.0, sigma=0.5, seed=seed)
+
+        arrival_rate = 1.2
+        agents = [MarketMakerAgent("MM1", arrival_rate=0.5)]
+        agents += [
+            NoiseTraderAgent(f"N{i}", fv, arrival_rate=arrival_rate)
+            for i in range(n_agents - 1)
+        ]
+
+        # Keep the amount of work per run roughly constant
+        horizon = max(1.0, target_events / (n_agents * arrival_rate))
+
+        for agent in agents:
+            engine.add_agent(agent)
+            engine.schedule(AgentArrivalEvent(agent.next_event_time(0), agent, env))
+
+        engine.schedule(SnapshotEvent(0, env))
+        engine.schedule(FairValueUpdateEvent(0, fv, dt=1.0))
+        engine.schedule(MarketCloseEvent(horizon))
+
+        start = time.perf_counter()
+        engine.run()
+        elapsed = time.perf_counter() - start
+
+        events = engine.seq - len(engine.event_queue)
+        results.append({
+            "agents": n_agents,
+            "horizon": horizon,
+            "events": events,
+            "trades": len(book.trades),
+            "seconds": elapsed,
+            "events_per_sec": events / elapsed if elapsed > 0 else None,
+        })
+
+    return results
+
+
+# =====================
+# NOISE TRADER CROWD
+# =====================
+
+def bench_population(crowd_sizes=CROWD_SIZES, target_events=ENGINE_EVENTS, seed=SEED):
+    # The same crowd of noise traders as individual agents and as one
+    # vectorized NoiseTraderPopulation
+    results = []
+
+    for n_traders in crowd_sizes:
+        arrival_rate = 1.2
+        horizon = max(1.0, target_events / (n_traders * arrival_rate))
+        row = {"traders": n_traders, "horizon": horizon}
+
+        for mode in ("agents", "population"):
+            random.seed(seed)
+            np.random.seed(seed)
+
+            book = OrderBook()
+            engine = MarketEngine(book, Logger())
+            env = MarketEnvironment(engine, MarketConfig(snapshot_interval=1.0))
+            fv = FairValueProcess(initial_value=100.0, sigma=0.5, seed=seed)
+
+            agents = [MarketMakerAgent("MM1", arrival_rate=0.5)]
+            if mode == "agents":
+                agents += [
+                    NoiseTraderAgent(f"N{i}", fv, arrival_rate=arrival_rate)
+                    for i in range(n_traders)
+                ]
+            else:
+                agents.append(NoiseTraderPopulation("P", fv, n_traders, seed=seed,
+                                                    arrival_rate=arrival_rate))
+
+            for agent in agents:
+                engine.add_agent(agent)
+                engine.schedule(AgentArrivalEvent(agent.next_event_time(0), agent, env))
+
+            engine.schedule(FairValueUpdateEvent(0, fv, dt=1.0))
+            engine.schedule(MarketCloseEvent(horizon))
+
+            start = time.perf_counter()
+            engine.run()
+            elapsed = time.perf_counter() - start
+
+            row[mode] = {
+                "orders": len(book.snapshots),
+                "trades": len(book.trades),
+                "seconds": elapsed,
+            }
+
+        results.append(row)
+
+    return results
+
+
+# =====================
+# TRADING ENV
+# =====================
+
+def bench_trading_env(n_steps=ENV_STEPS, seed=SEED):
+    from TradingEnv import TradingEnv
+
+    env = TradingEnv(seed=seed)
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, n_steps)
+    episodes = 0
+
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(int(action))
+        if terminated or truncated:
+            env.reset()
+            episodes += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "steps": n_steps,
+        "episodes": episodes,
+        "seconds": elapsed,
+        "steps_per_sec": n_steps / elapsed if elapsed > 0 else None,
+    }
+
+
+# =====================
+# LOGGER MEMORY
+# =====================
+
+def bench_logger_memory(n_records=LOGGER_RECORDS):
+    trade = Trade(price=100.0, qty=1, buy_order_id="N1-1.0", sell_order_id="MM1-0.5")
+    bids = [(99.0, 3), (98.0, 2), (97.0, 5), (96.0, 1), (95.0, 4)]
+    asks = [(101.0, 3), (102.0, 2), (103.0, 5), (104.0, 1), (105.0, 4)]
+    names = ["N1"]
+
+    recorders = {
+        "trade": lambda lg, i: lg.record_trade(trade),
+        "l1": lambda lg, i: lg.record_l1(float(i), 99.0, 101.0),
+        "l2": lambda lg, i: lg.record_l2(float(i), bids, asks),
+        "inventory": lambda lg, i: lg.record_inventory(float(i), names, np.array([i % 20])),
+    }
+
+    results = {}
+    scale = 1_000_000 / n_records
+
+    for name, record in recorders.items():
+        logger = Logger()
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        for i in range(n_records):
+            record(logger, i)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {
+            "records": n_records,
+            "bytes": current - base,
+            "mb_per_million": (current - base) * scale / 1e6,
+        }
+
+    return results
+
+
+# =====================
+# RUNNER
+# =====================
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+        },
+        "order_book": bench_order_book(),
+        "engine": bench_engine(),
+        "population": bench_population(),
+        "trading_env": bench_trading_env(),
+        "logger_memory": bench_logger_memory(),
+    }
+
+    with open(OUTPUT_PATH, "w") as f:
+        json.dump(report, f, indent=4)
+
+    print("\n=== Order book ===")
+    for r in report["order_book"]:
+        print(
+            f"size {r['book_size']:>6}: "
+            f"submit {r['submit']['ops_per_sec']:>10.0f}/s  "
+            f"cancel {r['cancel']['ops_per_sec']:>10.0f}/s  "
+            f"snapshot {r['current_snapshot']['ops_per_sec']:>10.0f}/s"
+        )
+
+    print("\n=== Engine ===")
+    for r in report["engine"]:
+        print(f"agents {r['agents']:>6}: {r['events_per_sec']:>10.0f} events/s")
+
+    print("\n=== Noise trader crowd (agents vs population) ===")
+    for r in report["population"]:
+        print(
+            f"traders {r['traders']:>6}: "
+            f"agents {r['agents']['seconds']:>7.3f}s  "
+            f"population {r['population']['seconds']:>7.3f}s"
+        )
+
+    print("\n=== TradingEnv ===")
+    print(f"{report['trading_env']['steps_per_sec']:.0f} steps/s")
+
+    print("\n=== Logger memory (MB per million records) ===")
+    for name, r in report["logger_memory"].items():
+        print(f"{name:>10}: {r['mb_per_million']:.1f}")
+
+    print(f"\nSaved {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from metrics import drawdown_curves
+
 def _truncate_runs(runs):
     """
     Truncate all runs to the minimum length.
@@ -41,16 +43,7 @@ def plot_drawdown_curves(results, output_path):
 
         aligned = _truncate_runs(valid_runs)
 
-        drawdowns = []
-        for run in aligned:
-            peak = run[0]
-            dd = []
-            for v in run:
-                peak = max(peak, v)
-                dd.append((peak - v) / peak)
-            drawdowns.append(dd)
-
-        mean_dd = np.mean(drawdowns, axis=0)
+        mean_dd = drawdown_curves(aligned).mean(axis=0)
         plt.plot(mean_dd, label=agent)
 
     plt.title("Drawdown Curves (Mean, Aligned Episodes)")
@@ -0,0 +1,51 @@
+import numpy as np
+
+from events import PolicyBatchEvent
+
+
+class PolicyInferenceService:
+    """
+    Shared, batched policy inference for PPOAgents.
+
+    Agents hand in their observation on arrival. The first submission
+    schedules a PolicyBatchEvent `window` time units later; when it
+    fires, every pending observation goes through one batched forward
+    pass and the resulting actions are applied for their agents.
+
+    The window acts as extra decision latency, so keep it small
+    relative to agent arrival rates.
+    """
+
+    def __init__(self, model, engine, env, window=0.1):
+        self.model = model
+        self.engine = engine
+        self.env = env
+        self.window = window
+        self.pending = []
+        self.flush_scheduled = False
+        self.batches = 0
+        self.decisions = 0
+
+    def submit(self, agent, obs, mid):
+        # Agents reuse their observation buffer, so keep a copy
+        self.pending.append((agent, obs.copy(), mid))
+        if not self.flush_scheduled:
+            self.engine.schedule(PolicyBatchEvent(self.engine.time + self.window, self))
+            self.flush_scheduled = True
+
+    def flush(self):
+        pending = self.pending
+        self.pending = []
+        self.flush_scheduled = False
+
+        if not pending:
+            return
+
+        obs = np.stack([o for _, o, _ in pending])
+        actions, _ = self.model.predict(obs, deterministic=True)
+
+        for (agent, _, mid), action in zip(pending, actions):
+            self.env.apply_action(agent, agent.map_action(action, mid))
+
+        self.batches += 1
+        self.decisions += len(pending)
@@ -1,16 +1,13 @@
 import random
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.stats import kurtosis, norm
-from statsmodels.tsa.stattools import acf
 
-from agents import NoiseTraderAgent, MarketMakerAgent, MomentumAgent
+from agents import NoiseTraderAgent, NoiseTraderPopulation, MarketMakerAgent, MomentumAgent
 from fair_value import FairValueProcess
 from order_book import OrderBook
 from engine import MarketEngine
 from environment import MarketEnvironment
 from logger import Logger
+from journal import EventJournal
 from market_config import MarketConfig
 from events import (
     AgentArrivalEvent,
@@ -23,15 +20,17 @@ from events import (
 # Simulation
 # -------------------------------
 
-def run_simulation(seed=42, horizon=1000):
-    random.seed(seed)
-    np.random.seed(seed)
-
-    book = OrderBook()
-    logger = Logger()
-    engine = MarketEngine(book, logger)
-    env = MarketEnvironment(engine, MarketConfig(snapshot_interval=1.0))
-
+def build_ecosystem(engine, env, seed=42, rng=None, crowd=0):
+    """
+    Register the standard agent population with the engine and schedule
+    their first arrivals, plus the snapshot and fair value processes.
+
+    Agents draw from rng (a random.Random) if given, otherwise from the
+    global `random` module, which must then be seeded first for
+    reproducible runs. crowd > 0 adds that many extra noise traders as
+    one NoiseTraderPopulation seeded from `seed`.
+    Returns (agents, fair_value_process).
+    """
     fv = FairValueProcess(initial_value=100.0, sigma=0.5, seed=seed)
 
     agents = [
@@ -44,15 +43,44 @@ def run_simulation(seed=42, horizon=1000):
     ]
 
     for agent in agents:
-        engine.agents[agent.agent_id] = agent
+        if rng is not None:
+            agent.rng = rng
+        engine.add_agent(agent)
         t0 = agent.next_event_time(0)
         engine.schedule(AgentArrivalEvent(t0, agent, env))
 
+    if crowd > 0:
+        population = NoiseTraderPopulation("P", fv, crowd, seed=seed, arrival_rate=1.2)
+        engine.add_agent(population)
+        engine.schedule(AgentArrivalEvent(population.next_event_time(0), population, env))
+        agents.append(population)
+
     engine.schedule(SnapshotEvent(0, env))
     engine.schedule(FairValueUpdateEvent(0, fv, dt=1.0))
+    return agents, fv
+
+
+def run_simulation(seed=42, horizon=1000, journal_path=None, sink=None, crowd=0):
+    # With a log_sink.ChunkedSink the logs are streamed to disk; read
+    # them back with log_sink.LogReader. crowd adds that many vectorized
+    # noise traders (see build_ecosystem).
+    random.seed(seed)
+    np.random.seed(seed)
+
+    book = OrderBook()
+    logger = Logger(sink=sink)
+    journal = EventJournal(journal_path) if journal_path is not None else None
+    engine = MarketEngine(book, logger, journal=journal)
+    env = MarketEnvironment(engine, MarketConfig(snapshot_interval=1.0))
+
+    build_ecosystem(engine, env, seed=seed, crowd=crowd)
     engine.schedule(MarketCloseEvent(horizon))
 
     engine.run()
+
+    if journal is not None:
+        journal.close()
+    logger.close()
     return logger
 
 
@@ -60,7 +88,14 @@ def run_simulation(seed=42, horizon=1000):
 # Stylized Facts Analysis
 # -------------------------------
 
+# Plotting / stats libraries are imported inside the analysis functions so
+# that importing run_simulation for the simulation alone stays cheap.
+
 def analyze_stylized_facts(logger):
+    import matplotlib.pyplot as plt
+    from scipy.stats import kurtosis, norm
+    from statsmodels.tsa.stattools import acf
+
     l1 = logger.l1_df()
     assert not l1.empty, "No L1 data recorded"
 
@@ -110,6 +145,9 @@ def analyze_stylized_facts(logger):
 
 # Herding Analysis
 def analyze_herding(logger, window=30):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     inv = logger.inventory_df()
     l1 = logger.l1_df().set_index("time")
 
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def validate_book_snapshot(snapshot):
     for price, qty in snapshot.bids:
         assert price >= 0
@@ -17,3 +20,9 @@ def validate_trades(trades_df):
     
     assert (trades_df.price >= 0).all()
     assert (trades_df.qty > 0).all()
+
+
+def validate_observation(obs, space):
+    assert obs.shape == space.shape, "Observation has incorrect shape"
+    assert np.all(np.isfinite(obs)), "Observation contains NaN or inf"
+    assert np.all(obs >= space.low) and np.all(obs <= space.high), "Observation outside bounds"
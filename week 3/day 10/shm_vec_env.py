@@ -0,0 +1,223 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+from stable_baselines3.common.env_util import is_wrapped
+from stable_baselines3.common.vec_env import VecEnv
+
+from TradingEnv import TradingEnv
+
+# Numeric info fields TradingEnv.step returns; they travel through shared
+# memory so a step never pickles a dict
+INFO_KEYS = ("portfolio_value", "drawdown", "inventory", "cash")
+
+
+def derive_seeds(seed, n):
+    """
+    Independent per-worker seeds derived from one run seed.
+    """
+    children = np.random.SeedSequence(seed).spawn(n)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+class _Buffers:
+    """
+    Named shared-memory arrays used by the parent and every worker.
+
+    Each worker only touches its own row.
+    """
+
+    def __init__(self, layout, names=None):
+        self.blocks = {}
+        self.arrays = {}
+        for key, (shape, dtype) in layout.items():
+            nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            if names is None:
+                block = shared_memory.SharedMemory(create=True, size=nbytes)
+            else:
+                block = shared_memory.SharedMemory(name=names[key])
+            self.blocks[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def names(self):
+        return {key: block.name for key, block in self.blocks.items()}
+
+    def close(self, unlink=False):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            if unlink:
+                block.unlink()
+
+
+def _serve(remote, env, index, arrays):
+    obs, actions, rewards = arrays["obs"][index], arrays["actions"], arrays["rewards"]
+    dones, truncated, infos = arrays["dones"], arrays["truncated"], arrays["infos"]
+    terminal = arrays["terminal_obs"][index]
+
+    while True:
+        cmd, data = remote.recv()
+
+        if cmd == "step":
+            ob, reward, term, trunc, info = env.step(int(actions[index]))
+            rewards[index] = reward
+            dones[index] = term or trunc
+            truncated[index] = trunc and not term
+            infos[index] = [info[key] for key in INFO_KEYS]
+            if term or trunc:
+                terminal[:] = ob
+                ob, _ = env.reset()
+            obs[:] = ob
+            remote.send(None)
+
+        elif cmd == "reset":
+            ob, _ = env.reset(seed=data)
+            obs[:] = ob
+            remote.send(None)
+
+        elif cmd == "get_attr":
+            remote.send(getattr(env, data))
+
+        elif cmd == "set_attr":
+            setattr(env, data[0], data[1])
+            remote.send(None)
+
+        elif cmd == "env_method":
+            name, args, kwargs = data
+            remote.send(getattr(env, name)(*args, **kwargs))
+
+        elif cmd == "is_wrapped":
+            remote.send(is_wrapped(env, data))
+
+        elif cmd == "close":
+            env.close()
+            remote.send(None)
+            return
+
+
+def _worker(remote, parent_remote, index, make_env, env_kwargs, seed, layout, names):
+    parent_remote.close()
+    env = make_env(seed=seed, **env_kwargs)
+    buffers = _Buffers(layout, names)
+    try:
+        _serve(remote, env, index, buffers.arrays)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        buffers.close()
+        remote.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    K TradingEnv instances running in worker processes.
+
+    Observations, actions, rewards, dones and the numeric info fields
+    live in shared-memory arrays, so a step only sends a short command
+    down each pipe and waits for an empty acknowledgement. Finished
+    envs auto-reset inside their worker, SB3 style.
+
+    Worker seeds come from np.random.SeedSequence(seed).spawn(K).
+    """
+
+    def __init__(self, n_workers, seed=42, make_env=TradingEnv, env_kwargs=None, start_method=None):
+        env_kwargs = env_kwargs or {}
+        probe = make_env(**env_kwargs)
+        observation_space, action_space = probe.observation_space, probe.action_space
+        probe.close()
+
+        obs_shape = observation_space.shape
+        self._layout = {
+            "obs": ((n_workers,) + obs_shape, observation_space.dtype),
+            "terminal_obs": ((n_workers,) + obs_shape, observation_space.dtype),
+            "actions": ((n_workers,), np.int64),
+            "rewards": ((n_workers,), np.float32),
+            "dones": ((n_workers,), np.bool_),
+            "truncated": ((n_workers,), np.bool_),
+            "infos": ((n_workers, len(INFO_KEYS)), np.float64),
+        }
+        self._buffers = _Buffers(self._layout)
+        self.worker_seeds = derive_seeds(seed, n_workers)
+
+        if start_method is None:
+            # fork is unsafe once torch threads exist
+            methods = mp.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in methods else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in range(n_workers)])
+        self.processes = []
+        for i, (work_remote, remote) in enumerate(zip(work_remotes, self.remotes)):
+            args = (work_remote, remote, i, make_env, env_kwargs, self.worker_seeds[i],
+                    self._layout, self._buffers.names)
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        self.closed = False
+        self.waiting = False
+        super().__init__(n_workers, observation_space, action_space)
+
+    def _broadcast(self, cmd, data=None, indices=None):
+        targets = [self.remotes[i] for i in self._get_indices(indices)]
+        for remote in targets:
+            remote.send((cmd, data))
+        return [remote.recv() for remote in targets]
+
+    def reset(self):
+        arrays = self._buffers.arrays
+        for remote, seed in zip(self.remotes, self._seeds):
+            remote.send(("reset", seed))
+        for remote in self.remotes:
+            remote.recv()
+        self._reset_seeds()
+        self._reset_options()
+        return arrays["obs"].copy()
+
+    def step_async(self, actions):
+        self._buffers.arrays["actions"][:] = np.asarray(actions).reshape(self.num_envs)
+        for remote in self.remotes:
+            remote.send(("step", None))
+        self.waiting = True
+
+    def step_wait(self):
+        for remote in self.remotes:
+            remote.recv()
+        self.waiting = False
+
+        a = self._buffers.arrays
+        dones = a["dones"].copy()
+        infos = [dict(zip(INFO_KEYS, row.tolist())) for row in a["infos"]]
+        for info in infos:
+            info["inventory"] = int(info["inventory"])
+        for i in np.flatnonzero(dones):
+            infos[i]["terminal_observation"] = a["terminal_obs"][i].copy()
+            infos[i]["TimeLimit.truncated"] = bool(a["truncated"][i])
+
+        return a["obs"].copy(), a["rewards"].copy(), dones, infos
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        self._broadcast("close")
+        for process in self.processes:
+            process.join()
+        self._buffers.close(unlink=True)
+        self.closed = True
+
+    def get_attr(self, attr_name, indices=None):
+        return self._broadcast("get_attr", attr_name, indices)
+
+    def set_attr(self, attr_name, value, indices=None):
+        self._broadcast("set_attr", (attr_name, value), indices)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return self._broadcast("env_method", (method_name, method_args, method_kwargs), indices)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return self._broadcast("is_wrapped", wrapper_class, indices)
@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+
+from journal import SUBMIT, CANCEL, AMEND, read_journal
+from order import Order
+
+# Background market tapes
+#
+# A tape is an EventJournal written by run_simulation: every order
+# submission, cancel and amend from the agent population, in time order.
+# Tape.load turns it into NumPy columns so an episode can replay any time
+# window straight into an order book without running agent code.
+
+TAPE_PATH = os.path.join("results", "background_tape.bin")
+SEED = 42
+HORIZON = 5_000
+
+_SIDES = ("BUY", "SELL")
+
+
+def record_tape(path, seed=42, horizon=1000):
+    """
+    Run the standard agent ecosystem and store its order flow at `path`.
+    """
+    from run_simulation import run_simulation
+
+    run_simulation(seed=seed, horizon=horizon, journal_path=path)
+    return path
+
+
+class Tape:
+    """
+    Columnar, in-memory copy of a recorded tape.
+
+    Fair value records are dropped; only book messages are kept.
+    """
+
+    def __init__(self, time, kind, order_id, side, price, qty):
+        self.time = time
+        self.kind = kind
+        self.order_id = order_id
+        self.side = side
+        self.price = price
+        self.qty = qty
+
+    @classmethod
+    def load(cls, path):
+        rows = [(kind, time, payload) for kind, time, payload in read_journal(path)
+                if kind in (SUBMIT, CANCEL, AMEND)]
+        n = len(rows)
+
+        time = np.empty(n, dtype=np.float64)
+        kind = np.empty(n, dtype=np.uint8)
+        order_id = np.empty(n, dtype=object)
+        side = np.zeros(n, dtype=np.uint8)
+        price = np.full(n, np.nan)
+        qty = np.zeros(n, dtype=np.int64)
+
+        for i, (k, t, payload) in enumerate(rows):
+            time[i] = t
+            kind[i] = k
+            if k == SUBMIT:
+                order_id[i], s, p, qty[i] = payload
+                side[i] = _SIDES.index(s)
+                if p is not None:
+                    price[i] = p
+            elif k == CANCEL:
+                order_id[i] = payload
+            else:
+                order_id[i], qty[i] = payload
+
+        return cls(time, kind, order_id, side, price, qty)
+
+    def __len__(self):
+        return len(self.time)
+
+    @property
+    def start_time(self):
+        return float(self.time[0]) if len(self) else 0.0
+
+    @property
+    def end_time(self):
+        return float(self.time[-1]) if len(self) else 0.0
+
+    def replay(self, order_book, t0, t1):
+        """
+        Feed the records with t0 < time <= t1 into an order book.
+
+        Returns the number of records replayed.
+        """
+        lo = np.searchsorted(self.time, t0, side="right")
+        hi = np.searchsorted(self.time, t1, side="right")
+
+        time, kind, order_id = self.time, self.kind, self.order_id
+        side, price, qty = self.side, self.price, self.qty
+
+        for i in range(lo, hi):
+            k = kind[i]
+            if k == SUBMIT:
+                p = price[i]
+                order_book.submit(Order(
+                    order_id[i], _SIDES[side[i]], None if p != p else float(p),
+                    int(qty[i]), time[i],
+                ))
+            elif k == CANCEL:
+                order_book.cancel(order_id[i])
+            else:
+                order_book.amend(order_id[i], int(qty[i]), time[i])
+
+        return hi - lo
+
+
+def main():
+    os.makedirs(os.path.dirname(TAPE_PATH), exist_ok=True)
+    record_tape(TAPE_PATH, seed=SEED, horizon=HORIZON)
+    tape = Tape.load(TAPE_PATH)
+    print(f"Recorded {len(tape)} book messages over t={tape.end_time:.1f} to {TAPE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The simulator modules import each other flat (from order_book import ...),
+# so the tests need the day 10 directory on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,55 @@
+from journal import EventJournal, SUBMIT, CANCEL, AMEND, read_journal, replay_journal
+from order import Order
+from order_book import OrderBook
+from run_simulation import run_simulation
+
+
+def book_state(book):
+    return sorted((o.order_id, o.side, o.price, o.qty) for o in book.orders.values())
+
+
+def test_replay_reproduces_live_run(tmp_path):
+    path = str(tmp_path / "journal.bin")
+    logger = run_simulation(seed=3, horizon=200, journal_path=path)
+
+    book = OrderBook()
+    replay_journal(path, book)
+
+    live = list(zip(logger.trade_price.view().tolist(), logger.trade_qty.view().tolist(),
+                    logger.trade_buy.view(), logger.trade_sell.view()))
+    replayed = [(t.price, t.qty, t.buy_order_id, t.sell_order_id) for t in book.trades]
+    assert replayed == live
+
+
+def test_second_run_replaces_journal(tmp_path):
+    path = str(tmp_path / "journal.bin")
+    run_simulation(seed=3, horizon=100, journal_path=path)
+    first = list(read_journal(path))
+    run_simulation(seed=3, horizon=100, journal_path=path)
+    assert list(read_journal(path)) == first
+
+
+def test_append_keeps_existing_records(tmp_path):
+    path = str(tmp_path / "journal.bin")
+    with EventJournal(path) as journal:
+        journal.record_fair_value(0.0, 100.0)
+    with EventJournal(path, append=True) as journal:
+        journal.record_fair_value(1.0, 101.0)
+    assert [payload for _, _, payload in read_journal(path)] == [100.0, 101.0]
+
+
+def test_record_round_trip(tmp_path):
+    path = str(tmp_path / "journal.bin")
+    with EventJournal(path) as journal:
+        journal.record_submit(1.0, Order("a", "BUY", 99, 3, 0))
+        journal.record_submit(2.0, Order("b", "SELL", None, 1, 0))
+        journal.record_amend(3.0, "a", 2)
+        journal.record_cancel(4.0, "a")
+        assert journal.records == 4
+
+    assert list(read_journal(path)) == [
+        (SUBMIT, 1.0, ("a", "BUY", 99, 3)),
+        (SUBMIT, 2.0, ("b", "SELL", None, 1)),
+        (AMEND, 3.0, ("a", 2)),
+        (CANCEL, 4.0, "a"),
+    ]
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from log_sink import ChunkedSink, LogReader
+from logger import Logger
+from run_simulation import run_simulation
+
+
+def assert_frames_equal(read, live):
+    # Text columns may come back as pandas strings rather than objects
+    # or categoricals; compare values
+    assert list(read.columns) == list(live.columns)
+    for name in live.columns:
+        left, right = read[name].to_numpy(), live[name].to_numpy()
+        if left.dtype.kind == "f":
+            assert np.allclose(left, right, equal_nan=True)
+        else:
+            assert left.astype(object).tolist() == right.astype(object).tolist()
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+@pytest.mark.parametrize("background", [False, True])
+def test_round_trip_matches_in_memory_logger(tmp_path, format, background):
+    live = run_simulation(seed=4, horizon=200)
+
+    sink = ChunkedSink(str(tmp_path), chunk_size=64, format=format, background=background)
+    streamed = run_simulation(seed=4, horizon=200, sink=sink)
+    reader = LogReader(str(tmp_path), format=format)
+
+    assert sink.parts["trades"] > 1  # really chunked
+    assert_frames_equal(reader.trades_df(), live.trades_df())
+    assert_frames_equal(reader.l1_df(), live.l1_df())
+    assert_frames_equal(reader.inventory_df(), live.inventory_df())
+
+    for read, expected in zip(reader.l2_arrays(), live.l2_arrays()):
+        assert np.allclose(read, expected, equal_nan=True)
+
+    # Flushed records are gone from memory
+    assert len(streamed.trade_price) == 0
+
+
+def test_iter_batches_streams_all_rows(tmp_path):
+    sink = ChunkedSink(str(tmp_path), chunk_size=50)
+    run_simulation(seed=4, horizon=200, sink=sink)
+    reader = LogReader(str(tmp_path))
+
+    rows = sum(batch.num_rows for batch in reader.iter_batches("trades", columns=["price"], batch_size=16))
+    assert rows == sink.rows["trades"]
+
+
+def test_empty_tables_keep_their_columns(tmp_path):
+    logger = Logger(sink=ChunkedSink(str(tmp_path), chunk_size=10))
+    logger.close()
+    reader = LogReader(str(tmp_path))
+    live = Logger()
+
+    for name in ("trades_df", "l1_df", "inventory_df"):
+        read, expected = getattr(reader, name)(), getattr(live, name)()
+        assert read.empty
+        assert list(read.columns) == list(expected.columns)
+
+    times, bids, asks = reader.l2_arrays()
+    assert times.shape == (0,)
+    assert bids.shape == asks.shape == (0, 5, 2)
+
+
+def test_new_sink_replaces_old_log(tmp_path):
+    run_simulation(seed=4, horizon=200, sink=ChunkedSink(str(tmp_path), chunk_size=20))
+    run_simulation(seed=4, horizon=50, sink=ChunkedSink(str(tmp_path), chunk_size=20))
+    live = run_simulation(seed=4, horizon=50)
+    assert len(LogReader(str(tmp_path)).trades_df()) == len(live.trade_price)
@@ -0,0 +1,198 @@
+from actions import Amend, Cancel, PlaceLimit
+from agents import ExternalAgent
+from engine import MarketEngine
+from environment import MarketEnvironment
+from logger import Logger
+from market_config import MarketConfig
+from order import Order
+from order_book import OrderBook, AMEND
+
+
+def resting(book):
+    return {o.order_id: o.qty for o in book.orders.values()}
+
+
+def queue(book, side="BUY"):
+    heap = book.bids if side == "BUY" else book.asks
+    return [order.order_id for _, _, order in sorted(heap, key=lambda x: x[:2])]
+
+
+# --------------------------------------------------
+# OrderBook.amend
+# --------------------------------------------------
+
+def test_amend_decrease_keeps_priority():
+    book = OrderBook()
+    book.submit(Order("a", "BUY", 99, 5, 0))
+    book.submit(Order("b", "BUY", 99, 5, 1))
+
+    assert book.amend("a", 2, timestamp=2)
+    assert resting(book) == {"a": 2, "b": 5}
+    assert queue(book) == ["a", "b"]
+
+    book.submit(Order("s", "SELL", None, 2, 3))
+    assert resting(book) == {"b": 5}
+
+
+def test_amend_increase_loses_priority():
+    book = OrderBook()
+    book.submit(Order("a", "BUY", 99, 5, 0))
+    book.submit(Order("b", "BUY", 99, 5, 1))
+
+    assert book.amend("a", 8, timestamp=2)
+    assert queue(book) == ["b", "a"]
+
+
+def test_amend_to_zero_cancels():
+    book = OrderBook()
+    book.submit(Order("a", "BUY", 99, 5, 0))
+    assert book.amend("a", 0)
+    assert resting(book) == {}
+    assert book.bids == []
+
+
+def test_amend_and_cancel_report_missing_orders():
+    book = OrderBook()
+    assert book.amend("missing", 3) is False
+    assert book.cancel("missing") is False
+
+
+def test_amend_notifies_subscribers():
+    book = OrderBook()
+    seen = []
+    book.subscribe(AMEND, lambda order, old_qty: seen.append((order.order_id, old_qty, order.qty)))
+    book.submit(Order("a", "SELL", 101, 4, 0))
+    book.amend("a", 1)
+    assert seen == [("a", 4, 1)]
+
+
+# --------------------------------------------------
+# Cancels and amends of orders still in flight
+# --------------------------------------------------
+
+def make_env():
+    engine = MarketEngine(OrderBook(), Logger())
+    env = MarketEnvironment(engine, MarketConfig())
+    agent = ExternalAgent("A")
+    engine.add_agent(agent)
+    return engine, env, agent
+
+
+def test_amend_in_flight_resizes_order_before_arrival():
+    engine, env, agent = make_env()
+    quote = PlaceLimit("BUY", 99, 1)
+    env.apply_action(agent, quote)
+    env.apply_action(agent, Amend(quote.order_id, 3))
+    assert agent.active_orders == {quote.order_id: 3}
+
+    engine.run_until(1_000)
+    assert resting(engine.order_book) == {quote.order_id: 3}
+    assert env.in_flight == {}
+
+
+def test_cancel_in_flight_never_reaches_book():
+    engine, env, agent = make_env()
+    quote = PlaceLimit("SELL", 101, 1)
+    env.apply_action(agent, quote)
+    env.apply_action(agent, Cancel(quote.order_id))
+
+    engine.run_until(1_000)
+    assert resting(engine.order_book) == {}
+    assert agent.active_orders == {}
+
+
+def test_failed_amend_is_not_journaled(tmp_path):
+    from journal import EventJournal, read_journal
+
+    engine, env, agent = make_env()
+    path = str(tmp_path / "journal.bin")
+    engine.journal = EventJournal(path)
+    env.apply_action(agent, Amend("missing", 2))
+    env.apply_action(agent, Cancel("missing"))
+    engine.journal.close()
+    assert list(read_journal(path)) == []
+
+
+def test_quote_manager_amends_in_flight_quote_once():
+    from order_manager import QuoteManager
+
+    engine, env, agent = make_env()
+    quotes = QuoteManager(agent)
+
+    for action in quotes.update({"BUY": (99, 1)}, tick_size=1):
+        env.apply_action(agent, action)
+    first = quotes.update({"BUY": (99, 2)}, tick_size=1)
+    assert [type(a) for a in first] == [Amend]
+    for action in first:
+        env.apply_action(agent, action)
+
+    # Still in flight: the amend took effect, so nothing is resent
+    assert quotes.update({"BUY": (99, 2)}, tick_size=1) == []
+    engine.run_until(1_000)
+    assert list(resting(engine.order_book).values()) == [2]
+
+
+# --------------------------------------------------
+# OrderBook.replace_orders and ladder quoting
+# --------------------------------------------------
+
+def test_replace_orders_swaps_ladder():
+    book = OrderBook()
+    book.submit(Order("old-1", "BUY", 98, 1, 0))
+    book.submit(Order("old-2", "BUY", 97, 1, 0))
+    book.submit(Order("other", "BUY", 96, 1, 0))
+
+    book.replace_orders(["old-1", "old-2"], [
+        Order("new-1", "BUY", 99, 1, 1),
+        Order("new-2", "BUY", 95, 1, 1),
+    ])
+    assert resting(book) == {"new-1": 1, "new-2": 1, "other": 1}
+    assert queue(book) == ["new-1", "other", "new-2"]
+
+
+def test_replace_orders_matches_crossing_orders():
+    book = OrderBook()
+    book.submit(Order("ask", "SELL", 100, 2, 0))
+    book.replace_orders([], [Order("bid", "BUY", 101, 3, 1)])
+
+    assert [(t.price, t.qty) for t in book.trades] == [(100, 2)]
+    assert resting(book) == {"bid": 1}
+
+
+def test_ladder_levels_on_distinct_ticks_at_half_tick_mid():
+    from agents import LadderMarketMakerAgent
+
+    engine, env, _ = make_env()
+    maker = LadderMarketMakerAgent("L", levels=10)
+    engine.add_agent(maker)
+    state = {"mid": 100.5, "best_bid": 100, "best_ask": 101, "l2": None, "tick_size": 1}
+    env.apply_action(maker, maker.get_action(state))
+    engine.run_until(1_000)
+
+    book = engine.order_book
+    bids = sorted((o.price, o.qty) for o in book.orders.values() if o.side == "BUY")
+    asks = sorted((o.price, o.qty) for o in book.orders.values() if o.side == "SELL")
+    assert bids == [(p, 1) for p in range(90, 100)]
+    assert asks == [(p, 1) for p in range(102, 112)]
+
+
+def test_ladder_maker_never_trades_with_itself():
+    import random
+    from agents import LadderMarketMakerAgent
+    from events import AgentArrivalEvent, MarketCloseEvent
+    from run_simulation import build_ecosystem
+
+    engine, env, _ = make_env()
+    build_ecosystem(engine, env, seed=1, rng=random.Random(1))
+    maker = LadderMarketMakerAgent("LMM")
+    maker.rng = random.Random(2)
+    engine.add_agent(maker)
+    engine.schedule(AgentArrivalEvent(maker.next_event_time(0), maker, env))
+    engine.schedule(MarketCloseEvent(300))
+    env.rng = random.Random(3)
+    engine.run()
+
+    trades = engine.order_book.trades
+    assert trades
+    assert not any(t.buy_order_id.startswith("LMM") and t.sell_order_id.startswith("LMM")
+                   for t in trades)
@@ -0,0 +1,35 @@
+import numpy as np
+
+from TradingEnv import TradingEnv
+from shm_vec_env import SharedMemoryVecEnv, derive_seeds
+
+
+def test_workers_match_single_envs_and_release_memory():
+    actions = np.random.default_rng(0).integers(0, 3, 20)
+
+    vec = SharedMemoryVecEnv(2, seed=7, start_method="spawn")
+    names = list(vec._buffers.names.values())
+    try:
+        obs = vec.reset()
+        rewards = []
+        for a in actions:
+            obs, reward, _, infos = vec.step(np.array([a, a]))
+            rewards.append(reward)
+            assert obs.shape == (2,) + vec.observation_space.shape
+        assert sorted(infos[0]) == ["cash", "drawdown", "inventory", "portfolio_value"]
+    finally:
+        vec.close()
+
+    for i, seed in enumerate(derive_seeds(7, 2)):
+        env = TradingEnv(seed=seed)
+        env.reset()
+        single = [env.step(int(a))[1] for a in actions]
+        assert np.allclose([r[i] for r in rewards], single, atol=1e-5)
+
+    from multiprocessing import shared_memory
+    for name in names:
+        try:
+            shared_memory.SharedMemory(name=name).close()
+        except FileNotFoundError:
+            continue
+        raise AssertionError(f"shared memory block {name} was not released")
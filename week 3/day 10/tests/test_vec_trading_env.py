@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from TradingEnv import TradingEnv
+from vec_trading_env import VecTradingEnv
+
+
+def make_env(n_envs=4):
+    env = VecTradingEnv(n_envs=n_envs, seed=0)
+    env.reset()
+    env.step(np.array([1, 0, 1, 0]))
+    return env
+
+
+def test_get_attr_indexes_per_env_state():
+    env = make_env()
+    assert env.get_attr("inventory") == [1, 0, 1, 0]
+    assert env.get_attr("inventory", [1, 2]) == [0, 1]
+    assert env.get_attr("cash", 3) == [env.cash[3]]
+
+
+def test_get_attr_repeats_shared_settings():
+    env = make_env()
+    assert env.get_attr("render_mode") == [None] * 4
+    assert env.get_attr("max_steps", [0, 2]) == [200, 200]
+
+
+def test_shared_array_of_num_envs_length_is_not_sliced():
+    env = make_env()
+    env.weights = np.arange(4.0)
+    values = env.get_attr("weights", [1])
+    assert len(values) == 1
+    assert np.array_equal(values[0], np.arange(4.0))
+
+
+def test_set_attr_writes_only_selected_rows():
+    env = make_env()
+    env.set_attr("inventory", 7, [2])
+    assert env.inventory.tolist() == [1, 0, 7, 0]
+
+
+def test_set_attr_shared_setting():
+    env = make_env()
+    env.set_attr("lambda_risk", 0.5)
+    assert env.lambda_risk == 0.5
+    with pytest.raises(NotImplementedError):
+        env.set_attr("lambda_risk", 0.1, [0])
+
+
+def test_env_method_is_not_supported():
+    env = make_env()
+    with pytest.raises(NotImplementedError):
+        env.env_method("reset")
+
+
+def test_episode_seeds_match_single_env():
+    n_steps = 30
+    actions = np.random.default_rng(1).integers(0, 3, n_steps)
+
+    vec = VecTradingEnv(n_envs=2, episode_seeds=[5, 6])
+    vec.reset()
+    values = []
+    for a in actions:
+        vec.step(np.array([a, a]))
+        values.append(vec.portfolio_value.copy())
+
+    for i, seed in enumerate((5, 6)):
+        env = TradingEnv(seed=seed)
+        env.reset()
+        single = [env.step(int(a))[4]["portfolio_value"] for a in actions]
+        assert np.allclose([v[i] for v in values], single)
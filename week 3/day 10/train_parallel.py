@@ -0,0 +1,45 @@
+import json
+import os
+from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import VecMonitor
+
+from shm_vec_env import SharedMemoryVecEnv
+
+SEED = 42
+N_WORKERS = os.cpu_count() or 1
+TRAIN_TIMESTEPS = 50_000  # same budget as train_best_agent.py
+ROLLOUT_SIZE = 2048       # total steps per PPO update, split across workers
+
+
+def main():
+    # Load best hyperparameters
+    with open("best_params.json", "r") as f:
+        best = json.load(f)
+
+    params = best["params"]
+
+    # One TradingEnv per worker process, seeds derived from SEED
+    env = VecMonitor(SharedMemoryVecEnv(N_WORKERS, seed=SEED))
+
+    model = PPO(
+        policy="MlpPolicy",
+        env=env,
+        learning_rate=params["learning_rate"],
+        gamma=params["gamma"],
+        ent_coef=params["ent_coef"],
+        n_steps=max(1, ROLLOUT_SIZE // N_WORKERS),
+        batch_size=64,
+        seed=SEED,
+        verbose=1,
+    )
+
+    model.learn(total_timesteps=TRAIN_TIMESTEPS)
+
+    model.save("ppo_trading_agent")
+    print(" Saved ppo_trading_agent.zip")
+
+    env.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import json
+from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import VecMonitor
+
+from vec_trading_env import VecTradingEnv
+
+SEED = 42
+N_ENVS = 16
+TRAIN_TIMESTEPS = 50_000  # same budget as train_best_agent.py
+ROLLOUT_SIZE = 2048       # total steps per PPO update, split across envs
+
+
+def main():
+    # Load best hyperparameters
+    with open("best_params.json", "r") as f:
+        best = json.load(f)
+
+    params = best["params"]
+
+    env = VecMonitor(VecTradingEnv(n_envs=N_ENVS, seed=SEED))
+
+    model = PPO(
+        policy="MlpPolicy",
+        env=env,
+        learning_rate=params["learning_rate"],
+        gamma=params["gamma"],
+        ent_coef=params["ent_coef"],
+        n_steps=ROLLOUT_SIZE // N_ENVS,
+        batch_size=64,
+        seed=SEED,
+        verbose=1,
+    )
+
+    model.learn(total_timesteps=TRAIN_TIMESTEPS)
+
+    # Same spaces as TradingEnv, so the model loads anywhere the
+    # single-env agent does
+    model.save("ppo_trading_agent")
+    print(" Saved ppo_trading_agent.zip")
+
+    env.close()
+
+
+if __name__ == "__main__":
+    main()
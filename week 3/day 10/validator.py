@@ -53,7 +53,7 @@ def run_scenario(agents, seed=42, horizon=500):
     fair_value = FairValueProcess(100.0, sigma=0.0, seed=seed)
 
     for agent in agents:
-        engine.agents[agent.agent_id] = agent
+        engine.add_agent(agent)
         engine.schedule(AgentArrivalEvent(agent.next_event_time(0), agent, env))
 
     engine.schedule(SnapshotEvent(0, env))
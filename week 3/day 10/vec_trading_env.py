@@ -0,0 +1,217 @@
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+from observation import ObservationEncoder
+from order_book import OrderBook
+
+
+class VecTradingEnv(VecEnv):
+    """
+    N independent copies of TradingEnv stepped in lockstep.
+
+    Same market model, spaces, reward and termination rules as
+    TradingEnv, but the state of every copy lives in NumPy arrays and a
+    step is a handful of array operations instead of N Python calls.
+
+    The agent only sends market orders into an otherwise empty book, so
+    nothing ever rests and the book block of the observation is the
+    same for every env. It is encoded once from an empty book and only
+    the inventory / cash columns are written per step.
+
+    Finished envs are reset automatically, following the SB3 convention:
+    the last observation goes into info["terminal_observation"] and
+    info["TimeLimit.truncated"] marks episodes cut by max_steps.
+
+    With episode_seeds, env i instead draws its price noise from
+    np.random.default_rng(episode_seeds[i]) exactly as a fresh
+    TradingEnv(seed=episode_seeds[i]) would, so the first episode of
+    every env reproduces the single-env run. Used for evaluation.
+    """
+
+    def __init__(
+        self,
+        n_envs=8,
+        max_steps=200,
+        book_depth=5,
+        max_inventory=20,
+        max_cash=100_000,
+        transaction_cost=0.01,
+        lambda_risk=0.001,
+        seed=42,
+        episode_seeds=None,
+    ):
+        self.max_steps = max_steps
+        self.book_depth = book_depth
+        self.max_inventory = max_inventory
+        self.max_cash = max_cash
+        self.transaction_cost = transaction_cost
+        self.lambda_risk = lambda_risk
+        self.price_vol = 0.1
+        self.render_mode = None
+
+        self._rng = np.random.default_rng(seed)
+
+        self.encoder = ObservationEncoder(book_depth, max_inventory, max_cash)
+        observation_space = spaces.Box(
+            low=0.0, high=1.0, shape=(self.encoder.size,), dtype=np.float32
+        )
+        super().__init__(n_envs, observation_space, spaces.Discrete(3))
+
+        # Per-env market state
+        self.mid_price = np.full(n_envs, 100.0)
+        self.inventory = np.zeros(n_envs, dtype=np.int64)
+        self.cash = np.full(n_envs, float(max_cash))
+        self.prev_value = self.cash.copy()
+        self.peak_value = self.cash.copy()
+        self.step_count = np.zeros(n_envs, dtype=np.int64)
+
+        self.portfolio_value = self.cash.copy()
+
+        self.obs = np.zeros((n_envs, self.encoder.size), dtype=np.float32)
+        self._actions = np.zeros(n_envs, dtype=np.int64)
+
+        # Pre-drawn noise per env: one draw on reset, two per step
+        self._noise = None
+        if episode_seeds is not None:
+            if len(episode_seeds) != n_envs:
+                raise ValueError("Need one episode seed per env")
+            width = 1 + 2 * max_steps
+            self._noise = np.stack([
+                np.random.default_rng(s).normal(0, self.price_vol, width)
+                for s in episode_seeds
+            ])
+            self._draws = np.zeros(n_envs, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # state helpers
+    # ------------------------------------------------------------------
+
+    def _reset_rows(self, idx):
+        self.inventory[idx] = 0
+        self.cash[idx] = float(self.max_cash)
+        self.prev_value[idx] = self.cash[idx]
+        self.peak_value[idx] = self.cash[idx]
+        self.step_count[idx] = 0
+
+    def _walk(self, idx=None):
+        # TradingEnv draws a new mid every time it builds an observation
+        if self._noise is not None:
+            rows = np.arange(self.num_envs) if idx is None else idx
+            cols = self._draws[rows] % self._noise.shape[1]
+            self.mid_price[rows] += self._noise[rows, cols]
+            self._draws[rows] += 1
+        elif idx is None:
+            self.mid_price += self._rng.normal(0, self.price_vol, self.num_envs)
+        else:
+            self.mid_price[idx] += self._rng.normal(0, self.price_vol, len(idx))
+        return self.mid_price
+
+    def _write_obs(self):
+        d = self.book_depth
+        self.obs[:, 4 * d] = (self.inventory + self.max_inventory) / (2 * self.max_inventory)
+        self.obs[:, 4 * d + 1] = self.cash / self.max_cash
+        np.clip(self.obs[:, 4 * d:], 0.0, 1.0, out=self.obs[:, 4 * d:])
+        return self.obs
+
+    # ------------------------------------------------------------------
+    # VecEnv interface
+    # ------------------------------------------------------------------
+
+    def reset(self):
+        if any(s is not None for s in self._seeds):
+            self._rng = np.random.default_rng([s for s in self._seeds if s is not None])
+        self._reset_seeds()
+        self._reset_options()
+
+        self._reset_rows(slice(None))
+        if self._noise is not None:
+            self.mid_price[:] = 100.0
+            self._draws[:] = 0
+        self._walk()
+
+        book = self.encoder.encode(OrderBook().current_snapshot(), 100.0, 0, self.max_cash)
+        self.obs[:] = book
+        return self._write_obs().copy()
+
+    def step_async(self, actions):
+        self._actions[:] = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        actions = self._actions
+        self.step_count += 1
+
+        mid = self._walk().copy()
+
+        buy = (actions == 1) & (self.cash >= mid)
+        sell = (actions == 2) & (self.inventory > 0)
+        self.inventory += buy.astype(np.int64) - sell.astype(np.int64)
+        self.cash += np.where(sell, mid, 0.0) - np.where(buy, mid, 0.0)
+
+        value = self.cash + self.inventory * mid
+        delta_value = value - self.prev_value
+        np.maximum(self.peak_value, value, out=self.peak_value)
+        drawdown = np.maximum(0.0, self.peak_value - value)
+        rewards = delta_value - self.transaction_cost * (actions != 0) - self.lambda_risk * drawdown
+        self.prev_value[:] = value
+        self.portfolio_value[:] = value
+
+        truncated = self.step_count >= self.max_steps
+        terminated = (np.abs(self.inventory) > self.max_inventory) | (self.cash <= 0)
+        dones = terminated | truncated
+
+        self._walk()
+        obs = self._write_obs()
+
+        infos = [
+            {
+                "portfolio_value": value[i],
+                "drawdown": drawdown[i],
+                "inventory": int(self.inventory[i]),
+                "cash": self.cash[i],
+            }
+            for i in range(self.num_envs)
+        ]
+
+        if dones.any():
+            idx = np.flatnonzero(dones)
+            for i in idx:
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i] and not terminated[i])
+            self._reset_rows(idx)
+            self._walk(idx)
+            obs = self._write_obs()
+
+        return obs.copy(), rewards.astype(np.float32), dones, infos
+
+    def close(self):
+        pass
+
+    # There are no sub-environment objects: the attributes in PER_ENV
+    # hold one row per env, everything else is a setting shared by all
+    # envs.
+    PER_ENV = ("mid_price", "inventory", "cash", "prev_value", "peak_value",
+               "step_count", "portfolio_value", "obs")
+
+    def get_attr(self, attr_name, indices=None):
+        value = getattr(self, attr_name)
+        indices = self._get_indices(indices)
+        if attr_name in self.PER_ENV:
+            return [value[i] for i in indices]
+        return [value for _ in indices]
+
+    def set_attr(self, attr_name, value, indices=None):
+        if attr_name in self.PER_ENV:
+            getattr(self, attr_name)[list(self._get_indices(indices))] = value
+        elif indices is None:
+            setattr(self, attr_name, value)
+        else:
+            raise NotImplementedError(f"{attr_name} is shared by all envs and cannot be set per env")
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        raise NotImplementedError(
+            "VecTradingEnv has no sub-environments; call methods on the vectorized env directly"
+        )
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]